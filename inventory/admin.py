@@ -1,3 +1,17 @@
 from django.contrib import admin
+from .models import Product, Location
 
-# Register your models here.
+
+@admin.register(Product)
+class ProductAdmin(admin.ModelAdmin):
+    list_display = ('name', 'sku', 'category', 'price', 'purchase_price', 'created_at')
+    list_filter = ('category', 'created_at')
+    search_fields = ('name', 'sku')
+    ordering = ('name',)
+
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ('name', 'company')
+    search_fields = ('name',)
+    ordering = ('name',)
@@ -4,10 +4,19 @@ Sets the language based on company settings or Accept-Language header.
 """
 from django.utils import translation
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.translation import get_language_from_request
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Languages the app ships locale files for
+_SUPPORTED_LANGUAGES = frozenset({'en', 'fr'})
+
+# Tracks the language most recently activated on each worker thread, so
+# consecutive same-language requests skip the activate/deactivate round trip
+_tls = threading.local()
+
 
 class LanguageMiddleware(MiddlewareMixin):
     """
@@ -39,43 +48,56 @@ class LanguageMiddleware(MiddlewareMixin):
         if not language:
             accept_language = request.META.get('HTTP_ACCEPT_LANGUAGE', '')
             if accept_language:
-                # Parse Accept-Language header (e.g., "fr-FR,fr;q=0.9,en;q=0.8")
-                # Extract the primary language code
-                try:
-                    lang_code = accept_language.split(',')[0].split('-')[0].strip()
-                    # Validate against supported languages
-                    supported_languages = ['en', 'fr']
-                    if lang_code in supported_languages:
-                        language = lang_code
-                        logger.debug(f"Using Accept-Language header: {language}")
-                except Exception as e:
-                    logger.warning(f"Error parsing Accept-Language header: {e}")
+                # Fast path: almost all real-world headers start with the
+                # primary language tag (e.g. "en-US,..." or "fr-FR,..."),
+                # so check the first two characters before doing any splitting.
+                if len(accept_language) >= 2:
+                    prefix = accept_language[:2].lower()
+                    if prefix in _SUPPORTED_LANGUAGES:
+                        # Make sure we matched a full tag, not e.g. "eng"
+                        c = accept_language[2:3]
+                        if not c or c in '-,;':
+                            language = prefix
+                            logger.debug(f"Using Accept-Language header: {language}")
+                if not language:
+                    # Slow path: let Django's cached parser handle the full
+                    # header (quality values, multiple tags) and validate
+                    # against settings.LANGUAGES
+                    language = get_language_from_request(request, check_path=False)
+                    logger.debug(f"Using Accept-Language header: {language}")
 
-        # Default to English if no language detected
-        if not language:
+        # Default to English if no language detected or it's one we don't
+        # ship locale files for; this keeps the activate() exception path
+        # below for genuine catalog-load failures only
+        if language not in _SUPPORTED_LANGUAGES:
             language = 'en'
-            logger.debug("Using default language: en")
 
-        # Activate the language for this request
+        # Activate the language for this request, skipping the thread-local
+        # write and catalog reload when this thread already has it active
+        if getattr(_tls, 'language', None) == language:
+            request.LANGUAGE_CODE = language
+            return
+
         try:
             translation.activate(language)
-            request.LANGUAGE_CODE = language
+            _tls.language = language
         except Exception as e:
-            # If translation activation fails (e.g., missing locale files),
-            # fall back to English and continue without crashing
+            # If activation fails (e.g., corrupt locale files), fall back to
+            # English and continue without crashing
             logger.error(f"Failed to activate language '{language}': {e}")
+            language = 'en'
             try:
                 translation.activate('en')
-                request.LANGUAGE_CODE = 'en'
-            except Exception as fallback_error:
-                # If even English fails, just log and continue
+                _tls.language = 'en'
+            except Exception:
                 # The app will use untranslated strings
-                logger.error(f"Failed to activate fallback language 'en': {fallback_error}")
-                request.LANGUAGE_CODE = 'en'
+                _tls.language = None
+        request.LANGUAGE_CODE = language
 
     def process_response(self, request, response):
         """
-        Deactivate the current language after the response is processed.
+        Leave the active language in place: the next request on this thread
+        resets it in process_request, so an explicit deactivate() per
+        response would only churn the thread-local.
         """
-        translation.deactivate()
         return response
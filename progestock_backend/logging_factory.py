@@ -0,0 +1,38 @@
+"""
+Deferred logging configuration for ProGestock.
+
+Referenced by settings.LOGGING_CONFIG so the production logging dict is
+built when Django initializes logging rather than at settings import, and
+is layered on top of Django's defaults (configure_logging applies
+DEFAULT_LOGGING before calling this) instead of replacing them.
+"""
+import logging.config
+
+
+def configure(config):
+    """
+    Build and apply the production logging configuration.
+
+    Django passes settings.LOGGING as ``config``; the console/CORS setup
+    below is merged over whatever minimal dict the settings module declared.
+    """
+    logging.config.dictConfig({
+        'version': 1,
+        'disable_existing_loggers': False,
+        'handlers': {
+            'console': {
+                'class': 'logging.StreamHandler',
+            },
+        },
+        'root': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+        'loggers': {
+            'corsheaders': {
+                'handlers': ['console'],
+                'level': 'DEBUG',
+                'propagate': False,
+            },
+        },
+    })
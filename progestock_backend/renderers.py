@@ -0,0 +1,45 @@
+"""
+JSON rendering for the ProGestock API.
+
+Uses orjson's C-level encoder when the package is installed (it handles
+the datetime-heavy list payloads several times faster than the stdlib
+encoder) and falls back to DRF's default renderer otherwise, keeping the
+dependency optional.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# DRF's encoder already knows how to coerce Decimal (to float, matching the
+# stock renderer), UUID, querysets, etc. orjson calls into it only for the
+# types it can't serialize natively.
+_fallback_encoder = encoders.JSONEncoder()
+
+# Match the stock renderer's output: UTC datetimes end in 'Z' and non-string
+# dict keys are coerced instead of raising
+_ORJSON_OPTIONS = None if orjson is None else (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in JSONRenderer that encodes with orjson when available.
+
+    Indented output (the browsable API's pretty-printing) still goes
+    through the default encoder, since orjson only supports two-space
+    indentation.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type or '', renderer_context)
+        if indent is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return orjson.dumps(data, default=_fallback_encoder.default, option=_ORJSON_OPTIONS)
@@ -5,50 +5,18 @@ This allows django-allauth and dj-rest-auth to send emails via SendGrid
 from django.core.mail.backends.base import BaseEmailBackend
 from django.conf import settings
 from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail, Content
+from sendgrid.helpers.mail import Mail, Content, MimeType
 import logging
-import threading
-from functools import wraps
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as SendTimeoutError
 
 logger = logging.getLogger(__name__)
 
 # Email sending timeout in seconds (prevent hanging requests)
 EMAIL_SEND_TIMEOUT = 10
 
-
-class TimeoutError(Exception):
-    """Custom timeout exception"""
-    pass
-
-
-def timeout_decorator(seconds):
-    """Decorator to add timeout to a function using threading"""
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            result = [TimeoutError(f'Function call timed out after {seconds} seconds')]
-
-            def target():
-                try:
-                    result[0] = func(*args, **kwargs)
-                except Exception as e:
-                    result[0] = e
-
-            thread = threading.Thread(target=target)
-            thread.daemon = True
-            thread.start()
-            thread.join(seconds)
-
-            if thread.is_alive():
-                # Thread is still running, timed out
-                raise TimeoutError(f'Function call timed out after {seconds} seconds')
-
-            if isinstance(result[0], Exception):
-                raise result[0]
-
-            return result[0]
-        return wrapper
-    return decorator
+# Shared worker pool for API calls: threads are reused across sends instead
+# of spawning (and leaking, on timeout) a fresh daemon thread per email
+_SEND_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='sendgrid')
 
 # Email template with logo
 EMAIL_TEMPLATE = """
@@ -102,23 +70,26 @@ class SendGridBackend(BaseEmailBackend):
             self.client = None
             logger.warning("SendGridBackend: No SENDGRID_API_KEY found")
 
+        # Logo URL is static per process - look it up once instead of per message
+        self.logo_url = getattr(settings, 'EMAIL_LOGO_URL', 'https://storage.googleapis.com/progestock_bucket/email_logo.png')
+
     def _wrap_in_template(self, content, is_html=False):
         """Wrap email content in branded template with logo"""
-        # Get logo URL from settings or use default
-        logo_url = getattr(settings, 'EMAIL_LOGO_URL', 'https://storage.googleapis.com/progestock_bucket/email_logo.png')
-
         # If content is not HTML, convert line breaks to <br> tags
         if not is_html:
             content = content.replace('\n', '<br>')
 
         # Wrap in template
-        return EMAIL_TEMPLATE.format(logo_url=logo_url, content=content)
+        return EMAIL_TEMPLATE.format(logo_url=self.logo_url, content=content)
 
     def send_messages(self, email_messages):
         """
         Send one or more EmailMessage objects and return the number of email
         messages sent.
         """
+        if not email_messages:
+            return 0
+
         if not self.client:
             logger.error("SendGrid client not initialized - cannot send emails")
             return 0
@@ -149,21 +120,19 @@ class SendGridBackend(BaseEmailBackend):
                     # Use HTML alternative if available, otherwise use body
                     content_to_wrap = html_content if html_content else message.body
                     wrapped_html = self._wrap_in_template(content_to_wrap, is_html=True)
-                    sg_mail.add_content(Content("text/html", wrapped_html))
+                    sg_mail.add_content(Content(MimeType.html, wrapped_html))
                 else:
                     # Wrap plain text in template
                     wrapped_html = self._wrap_in_template(message.body, is_html=False)
-                    sg_mail.add_content(Content("text/plain", message.body))
-                    sg_mail.add_content(Content("text/html", wrapped_html))
+                    sg_mail.add_content(Content(MimeType.text, message.body))
+                    sg_mail.add_content(Content(MimeType.html, wrapped_html))
 
                 # Send via SendGrid API with timeout protection
                 try:
-                    # Wrap the send call with timeout
-                    @timeout_decorator(EMAIL_SEND_TIMEOUT)
-                    def send_with_timeout():
-                        return self.client.send(sg_mail)
-
-                    response = send_with_timeout()
+                    # Run the send on the shared pool so a hung API call
+                    # can't block the request thread past the timeout
+                    future = _SEND_EXECUTOR.submit(self.client.send, sg_mail)
+                    response = future.result(timeout=EMAIL_SEND_TIMEOUT)
 
                     if response.status_code == 202:
                         logger.info(f"Email sent successfully to {message.to[0]}")
@@ -171,7 +140,7 @@ class SendGridBackend(BaseEmailBackend):
                     else:
                         logger.warning(f"SendGrid returned status {response.status_code} for {message.to[0]}")
 
-                except TimeoutError:
+                except SendTimeoutError:
                     logger.error(f"SendGrid timeout sending to {message.to[0]} (exceeded {EMAIL_SEND_TIMEOUT}s)")
                     # Don't re-raise timeout errors - log and continue
                     logger.warning(f"Email sending timed out but continuing registration")
@@ -7,8 +7,8 @@ It handles both transactional emails and emails with attachments (PDFs).
 
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import (
-    Mail, Attachment, FileContent, FileName, 
-    FileType, Disposition, Content
+    Mail, Attachment, FileContent, FileName,
+    FileType, Disposition, Content, MimeType
 )
 from django.conf import settings
 import base64
@@ -16,6 +16,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Shared across all attachments - Disposition is an immutable value holder,
+# so one instance per process beats one allocation per attachment
+_DISPOSITION_ATTACHMENT = Disposition('attachment')
+
 
 class SendGridEmailService:
     """
@@ -65,6 +69,9 @@ class SendGridEmailService:
             reply_to (str, optional): Reply-to email address
             attachments (list, optional): List of attachment dicts with keys:
                 - content (bytes): File content
+                - encoded_content (bytes, optional): Base64-encoded content;
+                  when provided, 'content' is not re-encoded (lets callers
+                  encode once and reuse across multiple sends)
                 - filename (str): File name
                 - mimetype (str): MIME type (e.g., 'application/pdf')
 
@@ -113,11 +120,11 @@ class SendGridEmailService:
             
             # Add content (HTML takes precedence)
             if html_content:
-                message.add_content(Content("text/html", html_content))
+                message.add_content(Content(MimeType.html, html_content))
                 if text_content:
-                    message.add_content(Content("text/plain", text_content))
+                    message.add_content(Content(MimeType.text, text_content))
             elif text_content:
-                message.add_content(Content("text/plain", text_content))
+                message.add_content(Content(MimeType.text, text_content))
             
             # Add reply-to if provided
             if reply_to:
@@ -127,13 +134,20 @@ class SendGridEmailService:
             if attachments:
                 for attachment_data in attachments:
                     attachment = Attachment()
-                    
-                    # Encode content to base64
-                    encoded = base64.b64encode(attachment_data['content']).decode()
+
+                    # Use pre-encoded content if the caller already did the
+                    # base64 work (e.g. the same PDF sent to several
+                    # recipients); otherwise encode here.
+                    encoded = attachment_data.get('encoded_content')
+                    if encoded is None:
+                        encoded = base64.b64encode(attachment_data['content'])
+                    if isinstance(encoded, bytes):
+                        # Mail payloads are JSON, so FileContent needs str
+                        encoded = encoded.decode('ascii')
                     attachment.file_content = FileContent(encoded)
                     attachment.file_name = FileName(attachment_data['filename'])
                     attachment.file_type = FileType(attachment_data['mimetype'])
-                    attachment.disposition = Disposition('attachment')
+                    attachment.disposition = _DISPOSITION_ATTACHMENT
                     
                     message.add_attachment(attachment)
             
@@ -1,7 +1,7 @@
 from pathlib import Path
 import environ
 import os
-from datetime import timedelta # Import timedelta for token lifetimes
+from django.utils.functional import SimpleLazyObject
 
 
 env = environ.Env(
@@ -10,10 +10,11 @@ env = environ.Env(
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-# Read .env file only if it exists (for local development)
-env_file = BASE_DIR / '.env'
-if env_file.exists():
-    environ.Env.read_env(env_file)
+# Read .env file if present (for local development). read_env swallows a
+# missing file itself, so no separate exists() stat is needed; production
+# images skip the attempt entirely via PROGESTOCK_SKIP_DOTENV=1.
+if not os.environ.get('PROGESTOCK_SKIP_DOTENV'):
+    environ.Env.read_env(BASE_DIR / '.env')
 
 SECRET_KEY = env('SECRET_KEY')
 DEBUG = env('DEBUG')
@@ -27,14 +28,24 @@ ALLOWED_HOSTS = [
     # 'your-backend-domain.com',
 ]
 
-# Add Railway domain if RAILWAY_PUBLIC_DOMAIN is set
-if 'RAILWAY_PUBLIC_DOMAIN' in os.environ:
-    ALLOWED_HOSTS.append(os.environ['RAILWAY_PUBLIC_DOMAIN'])
+# Railway domains - fetched once here and reused for CSRF trust below
+_RAILWAY_DOMAIN = env('RAILWAY_PUBLIC_DOMAIN', default=None)
+if _RAILWAY_DOMAIN:
+    ALLOWED_HOSTS.append(_RAILWAY_DOMAIN)
 
-# Add Railway static URL if RAILWAY_STATIC_URL is set
-if 'RAILWAY_STATIC_URL' in os.environ:
-    railway_domain = os.environ['RAILWAY_STATIC_URL'].replace('https://', '').replace('http://', '')
-    ALLOWED_HOSTS.append(railway_domain) 
+_RAILWAY_STATIC_URL = env('RAILWAY_STATIC_URL', default=None)
+if _RAILWAY_STATIC_URL:
+    ALLOWED_HOSTS.append(_RAILWAY_STATIC_URL.replace('https://', '').replace('http://', ''))
+
+# Google OAuth Configuration
+# Make Google OAuth optional - set empty values if not configured.
+# Read before INSTALLED_APPS so the allauth provider can be gated on it.
+GOOGLE_OAUTH_CLIENT_ID = env('GOOGLE_OAUTH_CLIENT_ID', default='')
+GOOGLE_OAUTH_CLIENT_SECRET = env('GOOGLE_OAUTH_CLIENT_SECRET', default='')
+
+# Whether media storage goes to Google Cloud Storage - read before
+# INSTALLED_APPS so django-storages is only installed when needed
+USE_GCS = env('USE_GCS', default=False, cast=bool)
 
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -59,11 +70,19 @@ INSTALLED_APPS = [
     'allauth',
     'allauth.account',
     'allauth.socialaccount',
-    'allauth.socialaccount.providers.google',
     'rest_framework_simplejwt.token_blacklist',
-    'storages',
 ]
 
+# django-storages is only used for the GCS backend; without it the whole
+# google-cloud-storage import tree is dead weight at startup
+if USE_GCS:
+    INSTALLED_APPS.append('storages')
+
+# The Google provider pulls in its whole OAuth import graph at django.setup(),
+# so only register it when credentials are actually configured
+if GOOGLE_OAUTH_CLIENT_ID:
+    INSTALLED_APPS.append('allauth.socialaccount.providers.google')
+
 AUTH_USER_MODEL = 'user.User'
 SITE_ID = 1
 
@@ -87,6 +106,11 @@ MIDDLEWARE = [
 # Custom domain for production (iOS cookie support)
 CUSTOM_DOMAIN = 'yourdomain.com'  # Replace with your actual domain
 
+# Shared cookie attributes - computed once so the session/CSRF/JWT cookie
+# settings below can't drift apart
+_COOKIE_DOMAIN = f'.{CUSTOM_DOMAIN}' if IS_PRODUCTION else None  # Leading dot for subdomain sharing
+_COOKIE_SAMESITE = 'None'  # Must be None for iOS Safari cross-subdomain cookies
+
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173",
     "http://127.0.0.1:5173",
@@ -132,17 +156,17 @@ CORS_ALLOW_CREDENTIALS = True
 
 # Cookie settings - Using custom domain for iOS compatibility
 SESSION_COOKIE_NAME = 'progestock-sessionid'
-SESSION_COOKIE_SAMESITE = 'None'  # Must be None for iOS Safari cross-subdomain cookies
+SESSION_COOKIE_SAMESITE = _COOKIE_SAMESITE
 SESSION_COOKIE_SECURE = IS_PRODUCTION
-SESSION_COOKIE_DOMAIN = f'.{CUSTOM_DOMAIN}' if IS_PRODUCTION else None  # Leading dot for subdomain sharing
+SESSION_COOKIE_DOMAIN = _COOKIE_DOMAIN
 SESSION_COOKIE_HTTPONLY = True
 SESSION_COOKIE_AGE = 1209600  # 2 weeks in seconds
 
 CSRF_COOKIE_NAME = 'progestock-csrftoken'
-CSRF_COOKIE_SAMESITE = 'None'  # Must be None for iOS Safari cross-subdomain cookies
+CSRF_COOKIE_SAMESITE = _COOKIE_SAMESITE
 CSRF_COOKIE_SECURE = IS_PRODUCTION
 CSRF_COOKIE_HTTPONLY = False  # Must be False so JavaScript can read it if needed
-CSRF_COOKIE_DOMAIN = f'.{CUSTOM_DOMAIN}' if IS_PRODUCTION else None  # Leading dot for subdomain sharing
+CSRF_COOKIE_DOMAIN = _COOKIE_DOMAIN
 
 CSRF_TRUSTED_ORIGINS = [
     "http://localhost:5173",
@@ -153,32 +177,32 @@ CSRF_TRUSTED_ORIGINS = [
     # "https://api.yourdomain.com",
 ]
 
-# Add Railway domains dynamically
-if 'RAILWAY_PUBLIC_DOMAIN' in os.environ:
-    railway_url = f"https://{os.environ['RAILWAY_PUBLIC_DOMAIN']}"
+# Add Railway domains dynamically (domain fetched once near the top)
+if _RAILWAY_DOMAIN:
+    railway_url = f"https://{_RAILWAY_DOMAIN}"
     if railway_url not in CSRF_TRUSTED_ORIGINS:
         CSRF_TRUSTED_ORIGINS.append(railway_url)
 
-# Add Vercel preview URLs dynamically if needed
-if IS_PRODUCTION:
-    import re
-    # This will trust all *.vercel.app subdomains for CSRF
-    # Note: CSRF_TRUSTED_ORIGINS doesn't support regex, so add common ones manually
-    pass
-
 ROOT_URLCONF = 'progestock_backend.urls'
 
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Compile each template once per process and reuse it; renders
+            # (email bodies in particular) only walk the cached node list
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
         },
     },
 ]
@@ -216,60 +240,67 @@ LOCALE_PATHS = [
 STATIC_URL = 'static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
-# Whitenoise configuration for serving static files in production
-USE_GCS = env('USE_GCS', default=False, cast=bool)
-
-# Initialize GCS_ENABLED flag
+# Initialize GCS_ENABLED flag (USE_GCS is read near the top of this file)
 GCS_ENABLED = False
 
-if USE_GCS:
+
+def _load_gcs_credentials():
+    """
+    Build GCS credentials from GS_CREDENTIALS (base64 JSON, JSON string, or
+    file path). Called lazily on first storage access so google-auth and its
+    cryptography dependencies stay out of the startup import graph.
+    """
     import json
     import base64
-    from google.oauth2 import service_account
     import logging
+    from google.oauth2 import service_account
 
     logger = logging.getLogger(__name__)
 
-    # GCS Settings
+    gcs_credentials_json = env('GS_CREDENTIALS', default=None)
+    if not gcs_credentials_json:
+        logger.warning("GS_CREDENTIALS not set. Falling back to local storage.")
+        return None
+
+    try:
+        # First, try to parse as base64-encoded JSON
+        try:
+            decoded = base64.b64decode(gcs_credentials_json).decode('utf-8')
+            credentials_dict = json.loads(decoded)
+            credentials = service_account.Credentials.from_service_account_info(credentials_dict)
+            logger.info("✅ GCS credentials loaded successfully from base64")
+            return credentials
+        except Exception:
+            # If base64 fails, try to parse as JSON string directly
+            credentials_dict = json.loads(gcs_credentials_json)
+            credentials = service_account.Credentials.from_service_account_info(credentials_dict)
+            logger.info("✅ GCS credentials loaded successfully from JSON")
+            return credentials
+    except (json.JSONDecodeError, ValueError):
+        # If not JSON, assume it's a file path
+        try:
+            credentials = service_account.Credentials.from_service_account_file(gcs_credentials_json)
+            logger.info("✅ GCS credentials loaded successfully from file")
+            return credentials
+        except Exception as file_err:
+            logger.warning(f"Failed to load GCS credentials: {file_err}. Falling back to local storage.")
+            return None
+
+
+if USE_GCS:
+    # GCS Settings - credentials themselves load on first use, not at startup
     try:
         GS_BUCKET_NAME = env('GS_BUCKET_NAME')
         GS_PROJECT_ID = env('GS_PROJECT_ID')
-
-        # Parse GCS credentials from JSON string, base64, or file
-        gcs_credentials_json = env('GS_CREDENTIALS', default=None)
-        if gcs_credentials_json:
-            try:
-                # First, try to parse as base64-encoded JSON
-                try:
-                    decoded = base64.b64decode(gcs_credentials_json).decode('utf-8')
-                    credentials_dict = json.loads(decoded)
-                    GS_CREDENTIALS = service_account.Credentials.from_service_account_info(credentials_dict)
-                    GCS_ENABLED = True
-                    logger.info("✅ GCS credentials loaded successfully from base64")
-                except Exception:
-                    # If base64 fails, try to parse as JSON string directly
-                    credentials_dict = json.loads(gcs_credentials_json)
-                    GS_CREDENTIALS = service_account.Credentials.from_service_account_info(credentials_dict)
-                    GCS_ENABLED = True
-                    logger.info("✅ GCS credentials loaded successfully from JSON")
-            except (json.JSONDecodeError, ValueError) as e:
-                # If not JSON, assume it's a file path
-                try:
-                    GS_CREDENTIALS = service_account.Credentials.from_service_account_file(gcs_credentials_json)
-                    GCS_ENABLED = True
-                    logger.info("✅ GCS credentials loaded successfully from file")
-                except Exception as file_err:
-                    logger.warning(f"Failed to load GCS credentials: {file_err}. Falling back to local storage.")
-                    GS_CREDENTIALS = None
-        else:
-            logger.warning("GS_CREDENTIALS not set. Falling back to local storage.")
-            GS_CREDENTIALS = None
-    except Exception as e:
-        logger.error(f"Error configuring GCS: {e}. Falling back to local storage.")
+        GS_CREDENTIALS = SimpleLazyObject(_load_gcs_credentials)
+        GCS_ENABLED = True
+    except Exception:
         GCS_ENABLED = False
 
-# Only use GCS if credentials are properly configured
-if GCS_ENABLED and GS_CREDENTIALS:
+# Only use GCS when the bucket settings are configured
+if GCS_ENABLED:
+    from datetime import timedelta
+
     # Use signed URLs instead of public URLs for better security
     GS_QUERYSTRING_AUTH = True  # Use signed URLs
     GS_EXPIRATION = timedelta(days=7)  # Set expiration for signed URLs to 7 days
@@ -311,6 +342,12 @@ else:
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
+    # orjson-backed JSON rendering (falls back to the default encoder when
+    # orjson isn't installed); browsable API kept for development
+    'DEFAULT_RENDERER_CLASSES': [
+        'progestock_backend.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
         'dj_rest_auth.jwt_auth.JWTCookieAuthentication',
@@ -364,9 +401,9 @@ REST_AUTH = {
     'JWT_AUTH_COOKIE': 'progestock-auth',
     'JWT_AUTH_REFRESH_COOKIE': 'progestock-refresh',
     'JWT_AUTH_HTTPONLY': True,
-    'JWT_AUTH_SAMESITE': 'None',  # Must be None for iOS Safari cross-subdomain cookies
+    'JWT_AUTH_SAMESITE': _COOKIE_SAMESITE,
     'JWT_AUTH_SECURE': IS_PRODUCTION,
-    'JWT_AUTH_COOKIE_DOMAIN': f'.{CUSTOM_DOMAIN}' if IS_PRODUCTION else None,  # Leading dot for subdomain sharing
+    'JWT_AUTH_COOKIE_DOMAIN': _COOKIE_DOMAIN,
     'JWT_AUTH_COOKIE_USE_CSRF': False,
     'JWT_AUTH_COOKIE_ENFORCE_CSRF_ON_UNAUTHENTICATED': False,
 
@@ -379,13 +416,11 @@ REST_AUTH = {
     # - remember_me=False: None (session cookies, deleted when browser closes)
 }
 
-# Google OAuth Configuration
-# Make Google OAuth optional - set empty values if not configured
-GOOGLE_OAUTH_CLIENT_ID = env('GOOGLE_OAUTH_CLIENT_ID', default='')
-GOOGLE_OAUTH_CLIENT_SECRET = env('GOOGLE_OAUTH_CLIENT_SECRET', default='')
-
-SOCIALACCOUNT_PROVIDERS = {
-    'google': {
+# Provider config only exists when Google OAuth is configured (credentials
+# are read near the top of this file, before INSTALLED_APPS)
+SOCIALACCOUNT_PROVIDERS = {}
+if GOOGLE_OAUTH_CLIENT_ID:
+    SOCIALACCOUNT_PROVIDERS['google'] = {
         'APP': {
             'client_id': GOOGLE_OAUTH_CLIENT_ID,
             'secret': GOOGLE_OAUTH_CLIENT_SECRET,
@@ -400,13 +435,14 @@ SOCIALACCOUNT_PROVIDERS = {
         },
         'VERIFIED_EMAIL': True,
     }
-}
 
 SOCIALACCOUNT_ADAPTER = 'user.adapters.CustomSocialAccountAdapter'
 SOCIALACCOUNT_AUTO_SIGNUP = True
 SOCIALACCOUNT_EMAIL_VERIFICATION = 'none'
 
 # JWT Configuration
+from datetime import timedelta  # noqa: E402 - only needed for token lifetimes
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
@@ -420,32 +456,28 @@ SIMPLE_JWT = {
     'AUTH_COOKIE_SECURE': IS_PRODUCTION,
     'AUTH_COOKIE_HTTP_ONLY': True,
     'AUTH_COOKIE_PATH': '/',
-    'AUTH_COOKIE_SAMESITE': 'None',  # Must be None for iOS Safari cross-subdomain cookies
-    'AUTH_COOKIE_DOMAIN': f'.{CUSTOM_DOMAIN}' if IS_PRODUCTION else None,  # Leading dot for subdomain sharing
+    'AUTH_COOKIE_SAMESITE': _COOKIE_SAMESITE,
+    'AUTH_COOKIE_DOMAIN': _COOKIE_DOMAIN,
 }
 
-CELERY_BROKER_URL = os.environ.get("CELERY_BROKER", "redis://localhost:6379/0")
-CELERY_RESULT_BACKEND = os.environ.get("CELERY_BROKER", "redis://localhost:6379/0")
+# Broker and result backend share the same Redis instance - read it once
+CELERY_BROKER_URL = CELERY_RESULT_BACKEND = env('CELERY_BROKER', default='redis://localhost:6379/0')
 
-# Logging for debugging CORS in production
+# Cache: Redis-backed in production (shared across workers, defaults to the
+# Celery instance), per-process in-memory cache in development where Redis
+# may not be running
 if IS_PRODUCTION:
-    LOGGING = {
-        'version': 1,
-        'disable_existing_loggers': False,
-        'handlers': {
-            'console': {
-                'class': 'logging.StreamHandler',
-            },
-        },
-        'root': {
-            'handlers': ['console'],
-            'level': 'INFO',
-        },
-        'loggers': {
-            'corsheaders': {
-                'handlers': ['console'],
-                'level': 'DEBUG',
-                'propagate': False,
-            },
-        },
-    }
\ No newline at end of file
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': env('REDIS_CACHE_URL', default=CELERY_BROKER_URL),
+        }
+    }
+
+# Logging for debugging CORS in production. The real dict lives in
+# logging_factory.configure and is built when Django initializes logging;
+# LOGGING here only needs to be truthy so configure_logging invokes the
+# factory (Django applies its DEFAULT_LOGGING first either way).
+if IS_PRODUCTION:
+    LOGGING_CONFIG = 'progestock_backend.logging_factory.configure'
+    LOGGING = {'version': 1}
\ No newline at end of file
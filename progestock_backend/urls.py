@@ -3,45 +3,74 @@ URL configuration for progestock_backend project.
 """
 from django.contrib import admin
 from django.urls import path, include
-from dj_rest_auth.views import LogoutView, PasswordResetView, PasswordResetConfirmView, UserDetailsView
-from rest_framework_simplejwt.views import TokenRefreshView
 from django.conf import settings
 from django.conf.urls.static import static
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from user.views import GoogleLoginView, CustomRegisterView, CustomLoginView
+from datetime import datetime, timezone
+from functools import lru_cache
+import json
+
+
+def lazy_view(dotted_path):
+    """
+    Defer importing a class-based view until its first request.
+
+    The URLConf is imported by every manage.py command via system checks,
+    so eagerly importing view modules here drags the whole DRF/auth stack
+    into commands that never serve a request. The resolved as_view()
+    callable is cached after the first dispatch.
+    """
+    @lru_cache(maxsize=None)
+    def get_view():
+        from django.utils.module_loading import import_string
+        return import_string(dotted_path).as_view()
+
+    def view(request, *args, **kwargs):
+        return get_view()(request, *args, **kwargs)
+
+    # DRF's APIView.as_view() marks its views csrf_exempt (DRF runs its own
+    # CSRF check inside SessionAuthentication). The wrapper must carry the
+    # same marker or CsrfViewMiddleware rejects these POSTs before dispatch.
+    view.csrf_exempt = True
+
+    return view
+
+# The api_root payload is completely static, so serialize it once at import
+# instead of rebuilding the dict and re-encoding it on every request
+_API_ROOT_BODY = json.dumps({
+    'message': 'Progestock API is running successfully',
+    'version': '1.0.0',
+    'status': 'online',
+    'endpoints': {
+        'authentication': {
+            'login': '/api/auth/login/',
+            'logout': '/api/auth/logout/',
+            'register': '/api/auth/registration/',
+            'google_login': '/api/auth/google/',
+            'user_details': '/api/auth/user/',
+            'token_refresh': '/api/auth/token/refresh/',
+            'password_reset': '/api/auth/password/reset/',
+        },
+        'resources': {
+            'dashboard': '/api/dashboard/',
+            'user': '/api/user/',
+            'company': '/api/company/',
+            'inventory': '/api/inventory/',
+            'sales': '/api/sales/',
+            'purchasing': '/api/purchasing/',
+            'reports': '/api/reports/',
+            'notifications': '/api/notifications/',
+        },
+        'admin': '/admin/',
+    },
+    'documentation': 'Contact your administrator for API documentation'
+})
 
 # Root API endpoint
 def api_root(request):
-    return JsonResponse({
-        'message': 'Progestock API is running successfully',
-        'version': '1.0.0',
-        'status': 'online',
-        'endpoints': {
-            'authentication': {
-                'login': '/api/auth/login/',
-                'logout': '/api/auth/logout/',
-                'register': '/api/auth/registration/',
-                'google_login': '/api/auth/google/',
-                'user_details': '/api/auth/user/',
-                'token_refresh': '/api/auth/token/refresh/',
-                'password_reset': '/api/auth/password/reset/',
-            },
-            'resources': {
-                'dashboard': '/api/dashboard/',
-                'user': '/api/user/',
-                'company': '/api/company/',
-                'inventory': '/api/inventory/',
-                'sales': '/api/sales/',
-                'purchasing': '/api/purchasing/',
-                'reports': '/api/reports/',
-                'notifications': '/api/notifications/',
-            },
-            'admin': '/admin/',
-        },
-        'documentation': 'Contact your administrator for API documentation'
-    })
+    return HttpResponse(_API_ROOT_BODY, content_type='application/json')
 
 # Health check endpoint for monitoring and keeping service awake
 @csrf_exempt  # Allow monitoring tools to ping without CSRF token
@@ -54,18 +83,17 @@ def health_check(request):
     return JsonResponse({
         'status': 'healthy',
         'service': 'progestock-backend',
-        'timestamp': __import__('datetime').datetime.now().isoformat()
+        'timestamp': datetime.now(timezone.utc).isoformat()
     })
 
-# Debug endpoint to check CORS and cookie configuration
+# Debug endpoint to check CORS and cookie configuration (DEBUG only)
 def debug_cors(request):
     """Debug endpoint to verify CORS headers and cookie settings"""
-    from django.conf import settings
     return JsonResponse({
         'origin': request.META.get('HTTP_ORIGIN', 'No origin header'),
         'cookies_received': list(request.COOKIES.keys()),
-        'cors_allowed_origins': settings.CORS_ALLOWED_ORIGINS if hasattr(settings, 'CORS_ALLOWED_ORIGINS') else [],
-        'cors_allow_credentials': settings.CORS_ALLOW_CREDENTIALS if hasattr(settings, 'CORS_ALLOW_CREDENTIALS') else False,
+        'cors_allowed_origins': settings.CORS_ALLOWED_ORIGINS,
+        'cors_allow_credentials': settings.CORS_ALLOW_CREDENTIALS,
         'is_production': not settings.DEBUG,
         'session_cookie_samesite': settings.SESSION_COOKIE_SAMESITE,
         'session_cookie_secure': settings.SESSION_COOKIE_SECURE,
@@ -80,20 +108,17 @@ urlpatterns = [
     # Health check endpoint (for monitoring and keeping service awake)
     path('health/', health_check, name='health_check'),
 
-    # Debug endpoint (remove in production after fixing issues)
-    path('debug/cors/', debug_cors, name='debug_cors'),
-
     path('admin/', admin.site.urls),
 
     # --- Authentication URLs (MUST come before dj_rest_auth.urls to override defaults) ---
-    path('api/auth/login/', CustomLoginView.as_view(), name='rest_login'),
-    path('api/auth/logout/', LogoutView.as_view(), name='rest_logout'),
-    path('api/auth/user/', UserDetailsView.as_view(), name='rest_user_details'),
-    path('api/auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
-    path('api/auth/password/reset/', PasswordResetView.as_view(), name='rest_password_reset'),
-    path('api/auth/password/reset/confirm/', PasswordResetConfirmView.as_view(), name='rest_password_reset_confirm'),
-    path('api/auth/registration/', CustomRegisterView.as_view(), name='rest_register'),
-    path('api/auth/google/', GoogleLoginView.as_view(), name='google_login'),
+    path('api/auth/login/', lazy_view('user.views.CustomLoginView'), name='rest_login'),
+    path('api/auth/logout/', lazy_view('dj_rest_auth.views.LogoutView'), name='rest_logout'),
+    path('api/auth/user/', lazy_view('dj_rest_auth.views.UserDetailsView'), name='rest_user_details'),
+    path('api/auth/token/refresh/', lazy_view('rest_framework_simplejwt.views.TokenRefreshView'), name='token_refresh'),
+    path('api/auth/password/reset/', lazy_view('dj_rest_auth.views.PasswordResetView'), name='rest_password_reset'),
+    path('api/auth/password/reset/confirm/', lazy_view('dj_rest_auth.views.PasswordResetConfirmView'), name='rest_password_reset_confirm'),
+    path('api/auth/registration/', lazy_view('user.views.CustomRegisterView'), name='rest_register'),
+    path('api/auth/google/', lazy_view('user.views.GoogleLoginView'), name='google_login'),
 
     # Include remaining dj_rest_auth URLs (after custom overrides)
     path('api/auth/', include('dj_rest_auth.urls')),
@@ -112,11 +137,13 @@ urlpatterns = [
     path('accounts/', include('allauth.urls')),
 ]
 
-# Serve media files during development
-# In production, whitenoise will handle serving media files if configured.
-# In development, this allows the Django dev server to serve them.
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# Debug endpoint is only routable in development - it leaks configuration
+# and costs settings lookups, so production never registers it
+if settings.DEBUG:
+    urlpatterns.append(path('debug/cors/', debug_cors, name='debug_cors'))
 
-# This is a safer way that still works for both dev and prod with whitenoise
-# if settings.DEBUG:
-#     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+# Serve media files during development only. static() is a no-op when
+# DEBUG=False anyway, and MEDIA_ROOT isn't defined at all when GCS storage
+# is active, so guard both before touching it.
+if settings.DEBUG and getattr(settings, 'MEDIA_ROOT', None):
+    urlpatterns.extend(static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT))
\ No newline at end of file
@@ -12,9 +12,11 @@ class SupplierAdmin(admin.ModelAdmin):
 
 class PurchaseOrderLineItemInline(admin.TabularInline):
     model = PurchaseOrderLineItem
-    extra = 1
+    extra = 0  # the "Add another" link covers new rows without rendering an unbound form
     fields = ('product', 'quantity_ordered', 'quantity_received', 'unit_price', 'discount_type', 'discount_value', 'line_total')
     readonly_fields = ('line_total',)
+    # AJAX search instead of rendering the entire product catalog per row
+    autocomplete_fields = ('product',)
 
 
 @admin.register(PurchaseOrder)
@@ -23,8 +25,38 @@ class PurchaseOrderAdmin(admin.ModelAdmin):
     list_filter = ('status', 'stock_added', 'order_date', 'created_at')
     search_fields = ('po_number', 'supplier__name')
     ordering = ('-created_at',)
+    # Changelist shows supplier per row - join it instead of one query per PO
+    list_select_related = ('supplier', 'company')
+    # Skip the unfiltered COUNT(*) the changelist runs for "x total" display
+    show_full_result_count = False
     inlines = [PurchaseOrderLineItemInline]
     readonly_fields = ('subtotal', 'tax_amount', 'total_amount', 'stock_added')
+    # Keep the change form from loading every supplier/company/location/user
+    # into a <select>
+    autocomplete_fields = ('supplier', 'company', 'receiving_location', 'created_by')
+
+    # Only the columns the form widgets actually display - keeps the change
+    # form from materializing full supplier/company/location/user rows
+    _FK_ONLY_FIELDS = {
+        'supplier': ('id', 'name'),
+        'company': ('id', 'name'),
+        'receiving_location': ('id', 'name', 'company_id'),
+        'created_by': ('id', 'email'),
+    }
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        only = self._FK_ONLY_FIELDS.get(db_field.name)
+        if only and 'queryset' not in kwargs:
+            kwargs['queryset'] = db_field.related_model._default_manager.only(*only)
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # Inline line-item edits bypass the serializer path and would leave
+        # the readonly line_total/PO totals stale; recompute both in two
+        # statements after the formsets are saved
+        PurchaseOrderLineItem.recalculate_for(form.instance)
+        form.instance.calculate_totals()
 
     fieldsets = (
         ('Basic Information', {
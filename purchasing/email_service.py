@@ -1,21 +1,71 @@
 """
 Email service for sending purchase orders to suppliers
 """
-from django.core.mail import EmailMessage
-from django.template.loader import render_to_string
+from django.core.mail import EmailMultiAlternatives
+from django.core.cache import cache
+from django.template.loader import get_template
 from django.conf import settings
-from .pdf_generator import generate_purchase_order_pdf
+from functools import lru_cache
+from .pdf_generator import get_purchase_order_pdf_cached
 from sales.utils import format_currency
 import logging
 import requests
-from io import BytesIO
+from email.mime.image import MIMEImage
 
 logger = logging.getLogger(__name__)
 
+# Shared session: keep-alive reuses sockets to the storage host across
+# logo downloads instead of a fresh TCP/TLS handshake per fetch
+_HTTP_SESSION = requests.Session()
+
+# Logo bytes rarely change; an hour of caching removes the per-email
+# download when the same company sends a batch of POs
+LOGO_CACHE_TTL = 3600
+
+# Content-ID the HTML template references for the inline logo
+_LOGO_CONTENT_ID = '<company_logo>'
+
+
+@lru_cache(maxsize=None)
+def _email_templates():
+    """Resolve the compiled email templates once per process."""
+    return (
+        get_template('purchasing/email/po_email.html'),
+        get_template('purchasing/email/po_email.txt'),
+    )
+
+
+def _download_logo(logo):
+    """Fetch raw logo bytes via the storage backend (GCS) or HTTPS."""
+    if getattr(settings, 'USE_GCS', False):
+        # django-storages reads the blob directly - no public HTTPS GET
+        with logo.open('rb') as f:
+            return f.read()
+    response = _HTTP_SESSION.get(logo.url, timeout=10)
+    response.raise_for_status()
+    return response.content
+
+
+def _get_company_logo_bytes(company):
+    """
+    Return (ext, bytes) for the company logo, cached per company.
+
+    The cache key includes the stored file name, so replacing the logo
+    invalidates the cached bytes automatically.
+    """
+    logo = company.logo
+    ext = logo.name.split('.')[-1] if '.' in logo.name else 'png'
+    key = f'po_logo:{company.pk}:{logo.name}'
+    data = cache.get_or_set(key, lambda: _download_logo(logo), timeout=LOGO_CACHE_TTL)
+    return ext, data
+
 
 def send_purchase_order_email(purchase_order, recipient_email=None):
     """
-    Send purchase order via email to supplier with PDF attachment
+    Queue a purchase order email for delivery to the supplier.
+
+    The actual work (PDF generation, logo download, SMTP) happens in a
+    Celery task so the request thread returns immediately.
 
     Args:
         purchase_order: PurchaseOrder instance
@@ -24,7 +74,8 @@ def send_purchase_order_email(purchase_order, recipient_email=None):
     Returns:
         dict: Result with success/error message
     """
-    # Use supplier email if not specified
+    # Resolve the recipient synchronously so the caller still gets an
+    # immediate error when the supplier has no email address
     if not recipient_email:
         recipient_email = purchase_order.supplier.email
 
@@ -34,182 +85,70 @@ def send_purchase_order_email(purchase_order, recipient_email=None):
             'error': 'No email address available for this supplier'
         }
 
+    # Imported here to avoid a circular import (tasks.py uses this module)
+    from .tasks import send_purchase_order_email_task
+    send_purchase_order_email_task.delay(purchase_order.id, recipient_email)
+
+    return {
+        'success': True,
+        'message': f'Purchase order queued for delivery to {recipient_email}'
+    }
+
+
+def _send_purchase_order_email_now(purchase_order, recipient_email, propagate_errors=False):
+    """
+    Build and send the purchase order email synchronously.
+
+    Called from the Celery task; use send_purchase_order_email from
+    request-path code instead.
+
+    Args:
+        purchase_order: PurchaseOrder instance
+        recipient_email: Resolved recipient email address
+        propagate_errors: Re-raise send failures instead of returning an
+            error dict - required by the Celery task so its autoretry
+            policy can see transient SMTP/HTTP exceptions
+
+    Returns:
+        dict: Result with success/error message
+    """
     try:
-        # Generate PDF
-        pdf_data = generate_purchase_order_pdf(purchase_order)
+        # PDF bytes come from the content-addressed cache, so resends and
+        # task retries skip the ReportLab layout entirely
+        pdf_data = get_purchase_order_pdf_cached(purchase_order)
 
         # Prepare email context
         context = {
             'po': purchase_order,
             'company': purchase_order.company,
             'supplier': purchase_order.supplier,
+            # Company logo is attached inline (cid:company_logo) further down
+            'has_logo': bool(purchase_order.company.logo),
+            'total_amount_display': format_currency(
+                purchase_order.total_amount, purchase_order.company.currency
+            ),
         }
 
-        # Render email body
         subject = f'Purchase Order {purchase_order.po_number} from {purchase_order.company.name}'
 
-        # Check if company has a logo for inline attachment
-        has_logo = bool(purchase_order.company.logo)
-
-        html_message = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                }}
-                .container {{
-                    max-width: 600px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                .header {{
-                    background-color: #2563eb;
-                    color: white;
-                    padding: 20px;
-                    text-align: center;
-                    border-radius: 8px 8px 0 0;
-                }}
-                .company-logo {{
-                    max-width: 150px;
-                    max-height: 80px;
-                    margin-bottom: 10px;
-                }}
-                .content {{
-                    background-color: #f9fafb;
-                    padding: 30px;
-                    border: 1px solid #e5e7eb;
-                }}
-                .details {{
-                    background-color: white;
-                    padding: 20px;
-                    margin: 20px 0;
-                    border-radius: 8px;
-                    border: 1px solid #e5e7eb;
-                }}
-                .details table {{
-                    width: 100%;
-                    border-collapse: collapse;
-                }}
-                .details td {{
-                    padding: 8px 0;
-                }}
-                .details td:first-child {{
-                    font-weight: bold;
-                    color: #6b7280;
-                    width: 40%;
-                }}
-                .footer {{
-                    text-align: center;
-                    padding: 20px;
-                    color: #6b7280;
-                    font-size: 12px;
-                }}
-                .button {{
-                    display: inline-block;
-                    background-color: #2563eb;
-                    color: white;
-                    padding: 12px 24px;
-                    text-decoration: none;
-                    border-radius: 6px;
-                    margin: 20px 0;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    {f'<img src="cid:company_logo" alt="{purchase_order.company.name}" class="company-logo" />' if has_logo else ''}
-                    <h1>Purchase Order</h1>
-                    <p>{purchase_order.po_number}</p>
-                </div>
-
-                <div class="content">
-                    <p>Dear {purchase_order.supplier.contact_person or 'Supplier'},</p>
-
-                    <p>Please find attached our purchase order <strong>{purchase_order.po_number}</strong> for your review and processing.</p>
-
-                    <div class="details">
-                        <table>
-                            <tr>
-                                <td>PO Number:</td>
-                                <td>{purchase_order.po_number}</td>
-                            </tr>
-                            <tr>
-                                <td>Order Date:</td>
-                                <td>{purchase_order.order_date.strftime('%B %d, %Y')}</td>
-                            </tr>
-                            {f'''<tr>
-                                <td>Expected Delivery:</td>
-                                <td>{purchase_order.expected_delivery_date.strftime('%B %d, %Y')}</td>
-                            </tr>''' if purchase_order.expected_delivery_date else ''}
-                            <tr>
-                                <td>Total Amount:</td>
-                                <td><strong>{format_currency(purchase_order.total_amount, purchase_order.company.currency)}</strong></td>
-                            </tr>
-                            <tr>
-                                <td>Receiving Location:</td>
-                                <td>{purchase_order.receiving_location.name}</td>
-                            </tr>
-                        </table>
-                    </div>
-
-                    <p>The complete purchase order details are attached as a PDF document. Please review and confirm receipt of this order.</p>
-
-                    {f'<p><strong>Additional Notes:</strong><br/>{purchase_order.notes}</p>' if purchase_order.notes else ''}
-
-                    <p>If you have any questions or concerns, please don't hesitate to contact us.</p>
-
-                    <p>Best regards,<br/>
-                    <strong>{purchase_order.company.name}</strong><br/>
-                    {getattr(purchase_order.company, 'email', '') or ''}</p>
-                </div>
-
-                <div class="footer">
-                    <p>This is an automated email. Please do not reply directly to this message.</p>
-                    <p>&copy; {purchase_order.company.name}. All rights reserved.</p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-
-        # Plain text version
-        text_message = f"""
-        Purchase Order {purchase_order.po_number}
-
-        Dear {purchase_order.supplier.contact_person or 'Supplier'},
-
-        Please find attached our purchase order {purchase_order.po_number} for your review and processing.
-
-        Order Details:
-        - PO Number: {purchase_order.po_number}
-        - Order Date: {purchase_order.order_date.strftime('%B %d, %Y')}
-        {f'- Expected Delivery: {purchase_order.expected_delivery_date.strftime("%B %d, %Y")}' if purchase_order.expected_delivery_date else ''}
-        - Total Amount: {format_currency(purchase_order.total_amount, purchase_order.company.currency)}
-        - Receiving Location: {purchase_order.receiving_location.name}
-
-        The complete purchase order details are attached as a PDF document.
-
-        {f'Additional Notes: {purchase_order.notes}' if purchase_order.notes else ''}
-
-        Best regards,
-        {purchase_order.company.name}
-        {getattr(purchase_order.company, 'email', '') or ''}
-        """
-
-        # Create email
+        # Render straight off the pre-resolved compiled templates; per email
+        # this is just a walk of the cached node list with the new context
+        html_template, text_template = _email_templates()
+        html_message = html_template.render(context)
+        text_message = text_template.render(context)
+
+        # Create email: multipart/related so the inline logo renders, with
+        # the plaintext body as a proper alternative of the HTML part
         company_email = getattr(purchase_order.company, 'email', None)
-        email = EmailMessage(
+        email = EmailMultiAlternatives(
             subject=subject,
             body=text_message,
             from_email=settings.DEFAULT_FROM_EMAIL,
             to=[recipient_email],
             reply_to=[company_email] if company_email else None,
         )
+        email.attach_alternative(html_message, 'text/html')
+        email.mixed_subtype = 'related'
 
         # Attach PDF
         email.attach(
@@ -218,42 +157,29 @@ def send_purchase_order_email(purchase_order, recipient_email=None):
             'application/pdf'
         )
 
-        # Set HTML content
-        email.content_subtype = 'html'
-        email.body = html_message
-
         # Attach company logo as inline image if it exists
         if purchase_order.company.logo:
             try:
-                # Download the logo from GCS
-                logo_url = purchase_order.company.logo.url
-                response = requests.get(logo_url, timeout=10)
-                response.raise_for_status()
-
-                # Get the file extension
-                logo_name = purchase_order.company.logo.name
-                ext = logo_name.split('.')[-1] if '.' in logo_name else 'png'
-
-                # Attach as inline image with Content-ID
-                email.attach(f'logo.{ext}', response.content, f'image/{ext}')
-                # Set the Content-ID for the attachment
-                email.attachments[-1] = (email.attachments[-1][0], email.attachments[-1][1], email.attachments[-1][2])
-                # Mark it as inline
-                from email.mime.image import MIMEImage
-                inline_image = MIMEImage(response.content)
-                inline_image.add_header('Content-ID', '<company_logo>')
+                # Cached per company - only the first email in a batch
+                # actually downloads the logo
+                ext, logo_bytes = _get_company_logo_bytes(purchase_order.company)
+
+                # Build the inline MIME part once and attach it directly,
+                # passing the subtype so MIMEImage skips content sniffing
+                subtype = 'jpeg' if ext in ('jpg', 'jpeg') else ext
+                inline_image = MIMEImage(logo_bytes, _subtype=subtype)
+                inline_image.add_header('Content-ID', _LOGO_CONTENT_ID)
                 inline_image.add_header('Content-Disposition', 'inline', filename=f'logo.{ext}')
-                # Replace the last attachment with our inline image
-                email.attachments[-1] = inline_image
+                email.attach(inline_image)
 
-                logger.info(f"Logo attached inline to purchase order email")
+                logger.info("Logo attached inline to purchase order email")
             except Exception as logo_error:
-                logger.warning(f"Failed to attach logo to email: {logo_error}")
+                logger.warning("Failed to attach logo to email: %s", logo_error)
                 # Email will still be sent without logo
 
         # Send email
         email.send(fail_silently=False)
-        logger.info(f"Purchase order {purchase_order.po_number} sent successfully to {recipient_email}")
+        logger.info("Purchase order %s sent successfully to %s", purchase_order.po_number, recipient_email)
 
         return {
             'success': True,
@@ -261,7 +187,9 @@ def send_purchase_order_email(purchase_order, recipient_email=None):
         }
 
     except Exception as e:
-        logger.error(f"Failed to send purchase order {purchase_order.po_number} to {recipient_email}: {str(e)}")
+        logger.error("Failed to send purchase order %s to %s: %s", purchase_order.po_number, recipient_email, e)
+        if propagate_errors:
+            raise
         return {
             'success': False,
             'error': str(e)
@@ -0,0 +1,38 @@
+"""
+Trigram index for the supplier admin search.
+
+Admin search on Supplier generates ILIKE '%term%' queries against name,
+contact_person and email; on PostgreSQL a GIN trigram index turns those
+from sequential scans into index seeks. SQLite (local development/tests)
+has no equivalent, so both operations no-op outside PostgreSQL.
+"""
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+def add_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS supplier_search_trgm ON purchasing_supplier "
+        "USING gin (name gin_trgm_ops, contact_person gin_trgm_ops, email gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS supplier_search_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('purchasing', '0001_initial'),
+    ]
+
+    operations = [
+        # CreateExtension already no-ops on non-PostgreSQL backends
+        TrigramExtension(),
+        migrations.RunPython(add_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-09-01 22:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("company", "0005_company_language"),
+        ("inventory", "0006_product_purchase_price"),
+        ("purchasing", "0002_supplier_trigram_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="purchaseorder",
+            index=models.Index(fields=["-created_at"], name="po_created_desc"),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.6 on 2026-09-01 22:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("company", "0005_company_language"),
+        ("inventory", "0006_product_purchase_price"),
+        ("purchasing", "0003_purchaseorder_po_created_desc"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="purchaseorder",
+            index=models.Index(
+                fields=["company", "-created_at"], name="purchasing__company_dd004a_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="purchaseorder",
+            index=models.Index(
+                fields=["company", "status"], name="purchasing__company_b9b51b_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="purchaseorder",
+            index=models.Index(
+                fields=["supplier", "-order_date"],
+                name="purchasing__supplie_271b48_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="purchaseorderlineitem",
+            index=models.Index(
+                fields=["purchase_order", "product"],
+                name="purchasing__purchas_034bf4_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="supplier",
+            index=models.Index(
+                fields=["company", "is_active"], name="purchasing__company_f2e22c_idx"
+            ),
+        ),
+    ]
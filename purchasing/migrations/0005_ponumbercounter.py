@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-09-01 23:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("company", "0005_company_language"),
+        ("purchasing", "0004_purchaseorder_purchasing__company_dd004a_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PONumberCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("last_number", models.PositiveIntegerField(default=0)),
+                (
+                    "company",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="po_number_counter",
+                        to="company.company",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.core.cache import cache
 from company.models import Company
 from inventory.models import Product, Location
 from decimal import Decimal
@@ -32,12 +33,62 @@ class Supplier(models.Model):
         indexes = [
             models.Index(fields=['name']),
             models.Index(fields=['is_active']),
+            # Multi-tenant listings filter on company + is_active together
+            models.Index(fields=['company', 'is_active']),
         ]
 
     def __str__(self):
         return self.name
 
 
+class PONumberCounter(models.Model):
+    """
+    Per-company counter backing sequential PO numbers.
+
+    One row per company, bumped with an atomic F() increment; replaces the
+    scan-for-latest-PO + retry loop that serialized concurrent creates.
+    """
+    company = models.OneToOneField(Company, on_delete=models.CASCADE, related_name='po_number_counter')
+    last_number = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.company} - {self.last_number}"
+
+    @classmethod
+    def next_number(cls, company):
+        """
+        Atomically reserve and return the next PO number for a company.
+
+        The first call seeds the counter from the company's highest
+        existing PO number. A failed create after reservation leaves a gap
+        in the sequence, which is harmless - numbers only need to be unique
+        and increasing.
+        """
+        from django.db import transaction
+
+        with transaction.atomic():
+            counter, _ = cls.objects.get_or_create(
+                company=company,
+                defaults={'last_number': cls._seed_for(company)},
+            )
+            cls.objects.filter(pk=counter.pk).update(
+                last_number=models.F('last_number') + 1
+            )
+            counter.refresh_from_db(fields=['last_number'])
+            return counter.last_number
+
+    @staticmethod
+    def _seed_for(company):
+        """Highest numeric suffix among the company's existing PO numbers."""
+        last_po = PurchaseOrder.objects.filter(company=company).order_by('-id').first()
+        if last_po and last_po.po_number:
+            try:
+                return int(last_po.po_number.split('-')[-1])
+            except (ValueError, IndexError):
+                pass
+        return 0
+
+
 class PurchaseOrder(models.Model):
     """
     Represents a purchase order sent to a supplier to restock inventory.
@@ -94,23 +145,46 @@ class PurchaseOrder(models.Model):
             models.Index(fields=['po_number']),
             models.Index(fields=['status']),
             models.Index(fields=['order_date']),
+            # Backs the default '-created_at' ordering used by the admin
+            # changelist and API listings
+            models.Index(fields=['-created_at'], name='po_created_desc'),
+            # Composite indexes matching the real query shapes: per-company
+            # listings ordered by recency, per-company status filters, and
+            # per-supplier order history
+            models.Index(fields=['company', '-created_at']),
+            models.Index(fields=['company', 'status']),
+            models.Index(fields=['supplier', '-order_date']),
         ]
 
     def __str__(self):
         return f"{self.po_number} - {self.supplier.name} - {self.get_status_display()}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Keep the cached statistics endpoint fresh; the 30s TTL bounds
+        # staleness for bulk paths that bypass save()
+        cache.delete(f'po:stats:{self.company_id}')
+
+    def delete(self, *args, **kwargs):
+        company_id = self.company_id
+        result = super().delete(*args, **kwargs)
+        cache.delete(f'po:stats:{company_id}')
+        return result
+
     def calculate_totals(self):
         """
         Calculate and update the purchase order totals based on line items.
+
+        The subtotal is summed in the database rather than by iterating
+        line-item model instances in Python.
         """
-        line_items = self.line_items.all()
-        self.subtotal = sum(
-            (item.line_total for item in line_items),
-            Decimal('0.00')
+        self.subtotal = (
+            self.line_items.aggregate(total=models.Sum('line_total'))['total']
+            or Decimal('0.00')
         )
         self.tax_amount = (self.subtotal * self.tax_rate) / Decimal('100')
         self.total_amount = self.subtotal + self.tax_amount + self.shipping_cost
-        self.save()
+        self.save(update_fields=['subtotal', 'tax_amount', 'total_amount', 'updated_at'])
 
     def add_stock_to_inventory(self):
         """
@@ -125,21 +199,42 @@ class PurchaseOrder(models.Model):
         if self.status != 'RECEIVED':
             return {"error": "Can only add stock for fully received orders"}
 
-        for line_item in self.line_items.all():
-            # Get or create stock record for this product at the receiving location
-            stock, created = Stock.objects.get_or_create(
-                product=line_item.product,
-                location=self.receiving_location,
-                defaults={'quantity': 0}
+        # Aggregate received quantities per product (a product can appear on
+        # several lines) so the whole PO lands in two queries instead of
+        # get_or_create + save per line item
+        received = {}
+        for product_id, quantity in self.line_items.values_list('product_id', 'quantity_received'):
+            if quantity:
+                received[product_id] = received.get(product_id, 0) + quantity
+
+        if received:
+            # Create any missing stock rows, then apply every increment in a
+            # single conditional UPDATE. bulk_create(update_conflicts=True)
+            # can't express "quantity = quantity + delta" - ON CONFLICT
+            # overwrites with the new row's value - so the two-statement
+            # ensure-then-increment form stays.
+            Stock.objects.bulk_create(
+                [
+                    Stock(product_id=product_id, location=self.receiving_location, quantity=0)
+                    for product_id in received
+                ],
+                ignore_conflicts=True,
+            )
+            Stock.objects.filter(
+                product_id__in=received, location=self.receiving_location
+            ).update(
+                quantity=models.F('quantity') + models.Case(
+                    *[
+                        models.When(product_id=product_id, then=models.Value(quantity))
+                        for product_id, quantity in received.items()
+                    ],
+                    default=models.Value(0),
+                )
             )
-
-            # Add the received quantity
-            stock.quantity += line_item.quantity_received
-            stock.save()
 
         # Mark that stock has been added
         self.stock_added = True
-        self.save()
+        self.save(update_fields=['stock_added', 'updated_at'])
 
         return {"success": True, "message": "Stock added successfully"}
 
@@ -175,13 +270,41 @@ class PurchaseOrderLineItem(models.Model):
 
     class Meta:
         ordering = ['id']
+        indexes = [
+            # Speeds the per-PO product lookups in stock receipt
+            models.Index(fields=['purchase_order', 'product']),
+        ]
 
     def __str__(self):
         return f"{self.product_name} x{self.quantity_ordered} - {self.purchase_order.po_number}"
 
-    def calculate_line_total(self):
+    @classmethod
+    def recalculate_for(cls, purchase_order):
+        """
+        Recalculate line_total for every line item of a purchase order in a
+        single UPDATE, pushing the quantity/price/discount arithmetic into
+        the database instead of one Python round-trip per row.
+        """
+        base_total = models.F('quantity_ordered') * models.F('unit_price')
+        discount = models.Case(
+            models.When(
+                discount_type='PERCENTAGE',
+                then=base_total * models.F('discount_value') / models.Value(100),
+            ),
+            default=models.F('discount_value'),
+        )
+        cls.objects.filter(purchase_order=purchase_order).update(
+            line_total=models.ExpressionWrapper(
+                base_total - discount,
+                output_field=models.DecimalField(max_digits=10, decimal_places=2),
+            )
+        )
+
+    def compute_line_total(self):
         """
-        Calculate the line total based on quantity, unit price, and discount.
+        Compute the line total from quantity, unit price, and discount
+        without touching the database (used to pre-fill rows before a
+        bulk_create).
         """
         base_total = self.quantity_ordered * self.unit_price
 
@@ -190,6 +313,12 @@ class PurchaseOrderLineItem(models.Model):
         else:  # FIXED
             discount_amount = self.discount_value
 
-        self.line_total = base_total - discount_amount
-        self.save()
+        return base_total - discount_amount
+
+    def calculate_line_total(self):
+        """
+        Calculate and persist the line total.
+        """
+        self.line_total = self.compute_line_total()
+        self.save(update_fields=['line_total', 'updated_at'])
         return self.line_total
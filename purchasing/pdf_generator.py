@@ -6,27 +6,338 @@ import os
 import io
 import qrcode
 import requests
+from requests.adapters import HTTPAdapter, Retry
+from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import BaseDocTemplate, Frame, NextPageTemplate, PageTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.enums import TA_RIGHT, TA_CENTER, TA_LEFT
 from django.conf import settings
-from sales.utils import format_currency
+from django.core.cache import cache
+from sales.utils import make_currency_formatter
+
+# Cached PDFs expire after a day; the key embeds the PO and line-item
+# modification times, so edits invalidate immediately regardless
+PDF_CACHE_TTL = 86400
+
+# Logo bytes cache: same key and TTL as the email service, so a PDF
+# generation and an email send for the same company share one download
+LOGO_CACHE_TTL = 3600
+
+# Keep-alive session for logo downloads across back-to-back generations,
+# with bounded pooling and retries on transient gateway errors
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+))
+
+# Separate connect/read timeouts: fail fast on unreachable hosts, allow
+# slower bodies
+_HTTP_TIMEOUT = (2, 10)
+
+
+def _optimize_logo_bytes(data):
+    """
+    Downscale the logo to its drawn size (1.2in at 150 DPI) and reduce it
+    to a 64-color indexed PNG. A multi-hundred-KB upload shrinks to a few
+    KB, which cuts both the embedded PDF size and ReportLab's decode time.
+    """
+    from PIL import Image as PILImage
+
+    img = PILImage.open(io.BytesIO(data))
+    if img.mode in ('RGBA', 'LA', 'P'):
+        # Flatten transparency onto white before palettizing
+        img = img.convert('RGBA')
+        background = PILImage.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[-1])
+        img = background
+    else:
+        img = img.convert('RGB')
+
+    target = int(1.2 * 150)
+    img.thumbnail((target, target), PILImage.LANCZOS)
+    img = img.quantize(colors=64, method=PILImage.MEDIANCUT)
+
+    out = io.BytesIO()
+    img.save(out, format='PNG', optimize=True)
+    return out.getvalue()
+
+
+def _logo_pdf_bytes(company):
+    """
+    Return PDF-optimized logo bytes for a company, filling both the raw
+    and optimized cache entries on a miss.
+    """
+    pdf_key = f'po_logo_pdf:{company.pk}:{company.logo.name}'
+    data = cache.get(pdf_key)
+    if data is None:
+        raw_key = f'po_logo:{company.pk}:{company.logo.name}'
+        raw = cache.get(raw_key)
+        if raw is None:
+            response = _HTTP_SESSION.get(company.logo.url, timeout=_HTTP_TIMEOUT)
+            response.raise_for_status()
+            raw = response.content
+            cache.set(raw_key, raw, LOGO_CACHE_TTL)
+        try:
+            data = _optimize_logo_bytes(raw)
+        except Exception as resize_error:
+            print(f"Error optimizing logo, embedding original: {resize_error}")
+            data = raw
+        cache.set(pdf_key, data, LOGO_CACHE_TTL)
+    return data
+
+
+@lru_cache(maxsize=1024)
+def _qr_reader(tracking_url):
+    """
+    ImageReader over the in-memory QR image, memoized per URL.
+
+    The grayscale PIL image goes to ReportLab directly - no PNG encode on
+    our side and no PNG decode on ReportLab's; the QR is embedded as a
+    small DeviceGray XObject. The matrix construction (Reed-Solomon
+    encode) runs once per URL thanks to the cache.
+    """
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=2,
+    )
+    qr.add_data(tracking_url)
+    qr.make(fit=True)
+
+    img = qr.make_image(fill_color="black", back_color="white").get_image().convert('L')
+    return ImageReader(img)
+
+
+# Decoded logo cache: ImageReader pre-decodes the image once and ReportLab
+# reuses its RGB data, so a batch of PDFs for one company decodes (and
+# embeds) the logo a single time. Bounded by the logo-bytes cache TTL only
+# in size, so cap it crudely.
+_LOGO_READERS = {}
+_LOGO_READERS_MAX = 256
+
+
+# Styles and table specs are identical for every document - built once at
+# import instead of per PDF. Paragraph flowables themselves are NOT hoisted:
+# they carry layout state and can't be reused across builds.
+_STYLES = getSampleStyleSheet()
+
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    alignment=TA_CENTER,
+    spaceAfter=12
+)
+
+_RIGHT_STYLE = ParagraphStyle(
+    'RightAlign',
+    parent=_STYLES['Normal'],
+    alignment=TA_RIGHT
+)
+
+_TOP_VALIGN_STYLE = TableStyle([
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+])
+
+# Label/value tables: bold labels come from the column style, so the cells
+# can be plain strings instead of Paragraphs (each Paragraph costs an XML
+# parse per cell)
+_INFO_TABLE_STYLE = TableStyle([
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+])
+
+_LINE_ITEMS_TABLE_STYLE = TableStyle([
+    # Header styling
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2563eb')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('TOPPADDING', (0, 0), (-1, 0), 12),
+
+    # Body styling
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ('ALIGN', (0, 0), (0, -1), 'CENTER'),  # Index column
+    ('ALIGN', (3, 0), (3, -1), 'CENTER'),  # Qty column
+    ('ALIGN', (4, 0), (-1, -1), 'RIGHT'),  # Price columns
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('TOPPADDING', (0, 1), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
+])
+
+_TOTALS_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('LINEABOVE', (0, -1), (-1, -1), 1, colors.black),
+    ('TOPPADDING', (0, -1), (-1, -1), 12),
+    # Emphasized total row, previously done with inline <font> markup
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, -1), (-1, -1), 12),
+])
+
+_TOTALS_WRAPPER_STYLE = TableStyle([
+    ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
+])
+
+
+@dataclass(slots=True)
+class _LineItemView:
+    """Pre-stringified line item values for the items table."""
+    index: str
+    name: str
+    sku: str
+    quantity: str
+    unit_price: str
+    discount: str
+    total: str
+
+
+@dataclass(slots=True)
+class _POView:
+    """
+    Flat, pre-stringified snapshot of the PO fields the PDF renders.
+
+    Built once per document so the section builders read plain strings
+    instead of repeating model attribute access, strftime and
+    get_status_display lookups in their loops.
+    """
+    po_number: str
+    status_display: str
+    order_date_str: str
+    expected_delivery_str: str
+    supplier_name: str
+    supplier_contact: str
+    supplier_email: str
+    supplier_phone: str
+    supplier_address: str
+    receiving_location_name: str
+    notes: str
+    terms: str
+    show_tax: bool
+    show_shipping: bool
+    subtotal_str: str
+    tax_label: str
+    tax_str: str
+    shipping_str: str
+    total_str: str
+    line_items: list
 
 
 class PurchaseOrderPDF:
     """Generate PDF for Purchase Orders with company branding"""
 
-    def __init__(self, purchase_order, template='default'):
+    def __init__(self, purchase_order, template='default', stream=None):
         self.po = purchase_order
         self.company = purchase_order.company
-        self.buffer = io.BytesIO()
+        # Materialized once; respects a prefetched line_items cache when the
+        # caller loaded one, and issues a single query otherwise
+        self.line_items = list(purchase_order.line_items.all())
+        # Callers may pass their own file-like object (spooled temp file,
+        # HTTP response) so the PDF is written in place instead of being
+        # copied out of an internal buffer afterwards
+        self.buffer = stream if stream is not None else io.BytesIO()
+        self.owns_buffer = stream is None
         self.pagesize = letter
         self.width, self.height = self.pagesize
         self.template = template  # 'default', 'modern', 'classic'
+        # Symbol/placement resolved once; every amount in this document
+        # formats through the specialized closure
+        self.format_amount = make_currency_formatter(self.company.currency)
+        # One pass over the model attributes up front; the section builders
+        # below only touch this flat snapshot
+        self.view = self._snapshot()
+
+    def _snapshot(self):
+        """
+        Build the pre-stringified view of the PO and its line items.
+
+        This single pass is where all per-row formatting happens: the
+        currency closure is already specialized per document, so the table
+        builder later just copies strings. Generating a per-currency row
+        formatter with exec() would only re-derive what this loop already
+        hoists, at the cost of runtime codegen.
+        """
+        po = self.po
+        supplier = po.supplier
+        fmt = self.format_amount
+
+        line_items = []
+        for idx, item in enumerate(self.line_items, 1):
+            if item.discount_value > 0:
+                if item.discount_type == 'PERCENTAGE':
+                    discount = f'{item.discount_value}%'
+                else:
+                    discount = fmt(item.discount_value)
+            else:
+                discount = '-'
+            line_items.append(_LineItemView(
+                index=str(idx),
+                name=item.product_name,
+                sku=item.product_sku,
+                quantity=str(item.quantity_ordered),
+                unit_price=fmt(item.unit_price),
+                discount=discount,
+                total=fmt(item.line_total),
+            ))
+
+        return _POView(
+            po_number=po.po_number,
+            status_display=po.get_status_display(),
+            order_date_str=po.order_date.strftime('%B %d, %Y'),
+            expected_delivery_str=(
+                po.expected_delivery_date.strftime('%B %d, %Y')
+                if po.expected_delivery_date else ''
+            ),
+            supplier_name=supplier.name,
+            supplier_contact=supplier.contact_person,
+            supplier_email=supplier.email,
+            supplier_phone=supplier.phone,
+            supplier_address=supplier.address,
+            receiving_location_name=po.receiving_location.name,
+            notes=po.notes,
+            terms=po.terms,
+            show_tax=po.tax_amount > 0,
+            show_shipping=po.shipping_cost > 0,
+            subtotal_str=fmt(po.subtotal),
+            tax_label='Tax ({:.1f}%):'.format(po.tax_rate),
+            tax_str=fmt(po.tax_amount),
+            shipping_str=fmt(po.shipping_cost),
+            total_str=fmt(po.total_amount),
+            line_items=line_items,
+        )
+
+    @classmethod
+    def for_id(cls, po_id, template='default'):
+        """
+        Build a generator for a PO id with every relation the PDF touches
+        loaded in a constant number of queries.
+        """
+        from django.db.models import Prefetch
+        from .models import PurchaseOrder, PurchaseOrderLineItem
+
+        purchase_order = PurchaseOrder.objects.select_related(
+            'company', 'supplier', 'receiving_location'
+        ).prefetch_related(
+            Prefetch(
+                'line_items',
+                queryset=PurchaseOrderLineItem.objects.select_related('product'),
+            )
+        ).get(pk=po_id)
+        return cls(purchase_order, template=template)
 
     def _get_logo_path(self):
         """Get the absolute path to company logo or download from GCS"""
@@ -37,170 +348,140 @@ class PurchaseOrderPDF:
                 if os.path.exists(logo_path):
                     return logo_path
             except (ValueError, NotImplementedError, AttributeError):
-                # Logo is stored in GCS, download it
+                # Logo is stored in GCS: serve from the shared cache, only
+                # downloading on a miss. Keyed by the stored file name (the
+                # signed URL itself changes on every access), so replacing
+                # the logo invalidates naturally. The email service reads
+                # the same key.
                 try:
-                    logo_url = self.company.logo.url
-                    response = requests.get(logo_url, timeout=10)
-                    response.raise_for_status()
-                    # Return BytesIO object instead of path
-                    return io.BytesIO(response.content)
+                    # PDF-optimized variant cached separately from the raw
+                    # bytes the email service uses; fresh BytesIO per call
+                    # since each ReportLab Image consumes the stream
+                    return io.BytesIO(_logo_pdf_bytes(self.company))
                 except Exception as e:
                     print(f"Error downloading logo from GCS: {e}")
                     pass
         return None
 
-    def _generate_qr_code(self):
-        """Generate QR code for PO tracking"""
-        # Create tracking URL (you can customize this based on your domain)
-        tracking_url = f"{settings.FRONTEND_URL or 'https://app.progestock.com'}/purchase-orders/{self.po.id}"
-
-        # Generate QR code
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=2,
-        )
-        qr.add_data(tracking_url)
-        qr.make(fit=True)
-
-        # Create an image from the QR Code
-        img = qr.make_image(fill_color="black", back_color="white")
-
-        # Save to BytesIO
-        qr_buffer = io.BytesIO()
-        img.save(qr_buffer, format='PNG')
-        qr_buffer.seek(0)
-
-        return qr_buffer
-
-    def _create_header(self, elements, styles):
-        """Create PDF header with company logo, info, and QR code"""
-        header_data = []
-
-        # Left: Company logo
-        logo_path = self._get_logo_path()
-        if logo_path:
+    def _get_logo_reader(self):
+        """Return a cached ImageReader for the company logo, or None."""
+        if not self.company.logo:
+            return None
+        key = (self.company.pk, self.company.logo.name)
+        reader = _LOGO_READERS.get(key)
+        if reader is None:
+            source = self._get_logo_path()
+            if source is None:
+                return None
+            try:
+                reader = ImageReader(source)
+            except Exception as e:
+                print(f"Error loading logo: {e}")
+                return None
+            if len(_LOGO_READERS) >= _LOGO_READERS_MAX:
+                _LOGO_READERS.clear()
+            _LOGO_READERS[key] = reader
+        return reader
+
+    # Vertical space reserved for the canvas-drawn header on page one
+    HEADER_HEIGHT = 1.5 * inch
+
+    def _draw_first_page(self, canvas, doc):
+        """Draw page-one chrome (logo, company info, QR) with the canvas API"""
+        self._draw_footer(canvas, doc)
+
+        canvas.saveState()
+        top = self.height - 0.75 * inch
+
+        # Left: company logo (falls back to nothing; the company name is
+        # always drawn in the middle column)
+        logo_reader = self._get_logo_reader()
+        if logo_reader is not None:
             try:
-                logo = Image(logo_path, width=1.2*inch, height=1.2*inch, kind='proportional')
+                canvas.drawImage(
+                    logo_reader,
+                    0.75 * inch, top - 1.2 * inch,
+                    width=1.2 * inch, height=1.2 * inch,
+                    preserveAspectRatio=True, mask='auto',
+                )
             except Exception as e:
                 print(f"Error loading logo: {e}")
-                logo = Paragraph(f'<b>{self.company.name}</b>', styles['Heading1'])
-        else:
-            logo = Paragraph(f'<b>{self.company.name}</b>', styles['Heading1'])
-
-        # Middle: Company information
-        company_info_text = f'''<b><font size="16">{self.company.name}</font></b><br/>'''
-
-        # Add company details if available (using getattr for optional fields)
-        address = getattr(self.company, 'address', None)
-        phone = getattr(self.company, 'phone', None)
-        email = getattr(self.company, 'email', None)
-
-        if address or phone or email:
-            company_info_text += '<font size="9">'
-            if address:
-                company_info_text += f'{address}<br/>'
-            if phone:
-                company_info_text += f'{phone}<br/>'
-            if email:
-                company_info_text += f'{email}<br/>'
-            company_info_text += '</font>'
-
-        company_info = Paragraph(company_info_text, styles['Normal'])
-
-        # Right: QR Code for tracking
+
+        # Middle: company information
+        text_x = 2.4 * inch
+        canvas.setFont('Helvetica-Bold', 16)
+        canvas.drawString(text_x, top - 0.25 * inch, self.company.name)
+
+        canvas.setFont('Helvetica', 9)
+        line_y = top - 0.45 * inch
+        for value in (
+            getattr(self.company, 'address', None),
+            getattr(self.company, 'phone', None),
+            getattr(self.company, 'email', None),
+        ):
+            if value:
+                canvas.drawString(text_x, line_y, str(value))
+                line_y -= 0.16 * inch
+
+        # Right: QR code for tracking
         try:
-            qr_buffer = self._generate_qr_code()
-            qr_image = Image(qr_buffer, width=1*inch, height=1*inch)
-            qr_cell = qr_image
+            tracking_url = f"{settings.FRONTEND_URL or 'https://app.progestock.com'}/purchase-orders/{self.po.id}"
+            canvas.drawImage(
+                _qr_reader(tracking_url),
+                self.width - 1.75 * inch, top - 1 * inch,
+                width=1 * inch, height=1 * inch,
+            )
         except Exception as e:
             print(f"Error generating QR code: {e}")
-            qr_cell = ''
-
-        header_data.append([logo, company_info, qr_cell])
-
-        header_table = Table(header_data, colWidths=[1.5*inch, 4*inch, 1.5*inch])
-        header_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-            ('ALIGN', (1, 0), (1, 0), 'LEFT'),
-            ('ALIGN', (2, 0), (2, 0), 'RIGHT'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
-        elements.append(header_table)
-        elements.append(Spacer(1, 0.3*inch))
+
+        canvas.restoreState()
 
     def _create_title(self, elements, styles):
         """Create document title"""
-        title = Paragraph(
-            '<b><font size="16">PURCHASE ORDER</font></b>',
-            ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                alignment=TA_CENTER,
-                spaceAfter=12
-            )
-        )
+        title = Paragraph('<b><font size="16">PURCHASE ORDER</font></b>', _TITLE_STYLE)
         elements.append(title)
         elements.append(Spacer(1, 0.2*inch))
 
     def _create_info_section(self, elements, styles):
         """Create PO information section"""
+        view = self.view
+
+        # Plain strings throughout; bold labels come from the table style.
+        # Only values that may need to wrap stay as Paragraphs.
         # Left side - PO details
         left_info = [
-            [Paragraph('<b>PO Number:</b>', styles['Normal']), Paragraph(self.po.po_number, styles['Normal'])],
-            [Paragraph('<b>Status:</b>', styles['Normal']), Paragraph(self.po.get_status_display(), styles['Normal'])],
-            [Paragraph('<b>Order Date:</b>', styles['Normal']), Paragraph(self.po.order_date.strftime('%B %d, %Y'), styles['Normal'])],
+            ['PO Number:', view.po_number],
+            ['Status:', view.status_display],
+            ['Order Date:', view.order_date_str],
         ]
 
-        if self.po.expected_delivery_date:
-            left_info.append([
-                Paragraph('<b>Expected Delivery:</b>', styles['Normal']),
-                Paragraph(self.po.expected_delivery_date.strftime('%B %d, %Y'), styles['Normal'])
-            ])
+        if view.expected_delivery_str:
+            left_info.append(['Expected Delivery:', view.expected_delivery_str])
 
         # Right side - Supplier details
         right_info = [
-            [Paragraph('<b>Supplier:</b>', styles['Normal']), Paragraph(self.po.supplier.name, styles['Normal'])],
+            ['Supplier:', Paragraph(view.supplier_name, styles['Normal'])],
         ]
 
-        if self.po.supplier.contact_person:
-            right_info.append([
-                Paragraph('<b>Contact Person:</b>', styles['Normal']),
-                Paragraph(self.po.supplier.contact_person, styles['Normal'])
-            ])
-        if self.po.supplier.email:
-            right_info.append([
-                Paragraph('<b>Email:</b>', styles['Normal']),
-                Paragraph(self.po.supplier.email, styles['Normal'])
-            ])
-        if self.po.supplier.phone:
-            right_info.append([
-                Paragraph('<b>Phone:</b>', styles['Normal']),
-                Paragraph(self.po.supplier.phone, styles['Normal'])
-            ])
-        if self.po.supplier.address:
-            right_info.append([
-                Paragraph('<b>Address:</b>', styles['Normal']),
-                Paragraph(self.po.supplier.address, styles['Normal'])
-            ])
+        if view.supplier_contact:
+            right_info.append(['Contact Person:', view.supplier_contact])
+        if view.supplier_email:
+            right_info.append(['Email:', view.supplier_email])
+        if view.supplier_phone:
+            right_info.append(['Phone:', view.supplier_phone])
+        if view.supplier_address:
+            right_info.append(['Address:', Paragraph(view.supplier_address, styles['Normal'])])
 
         # Create tables
         left_table = Table(left_info, colWidths=[1.5*inch, 2*inch])
-        left_table.setStyle(TableStyle([
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
+        left_table.setStyle(_INFO_TABLE_STYLE)
 
         right_table = Table(right_info, colWidths=[1.5*inch, 2*inch])
-        right_table.setStyle(TableStyle([
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
+        right_table.setStyle(_INFO_TABLE_STYLE)
 
         # Combine into two columns
         info_table = Table([[left_table, right_table]], colWidths=[3.5*inch, 3.5*inch])
-        info_table.setStyle(TableStyle([
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
+        info_table.setStyle(_TOP_VALIGN_STYLE)
 
         elements.append(info_table)
         elements.append(Spacer(1, 0.3*inch))
@@ -210,136 +491,88 @@ class PurchaseOrderPDF:
         # Table headers
         data = [['#', 'Product', 'SKU', 'Qty', 'Unit Price', 'Discount', 'Total']]
 
-        # Add line items
-        for idx, item in enumerate(self.po.line_items.all(), 1):
-            discount_display = ''
-            if item.discount_value > 0:
-                if item.discount_type == 'PERCENTAGE':
-                    discount_display = f'{item.discount_value}%'
-                else:
-                    discount_display = format_currency(item.discount_value, self.company.currency)
-            else:
-                discount_display = '-'
-
+        # Add line items (all values pre-stringified in the snapshot)
+        for item in self.view.line_items:
             data.append([
-                str(idx),
-                item.product_name,
-                item.product_sku,
-                str(item.quantity_ordered),
-                format_currency(item.unit_price, self.company.currency),
-                discount_display,
-                format_currency(item.line_total, self.company.currency)
+                item.index,
+                item.name,
+                item.sku,
+                item.quantity,
+                item.unit_price,
+                item.discount,
+                item.total,
             ])
 
         # Create table
         table = Table(data, colWidths=[0.4*inch, 2.2*inch, 1*inch, 0.6*inch, 1*inch, 0.8*inch, 1*inch])
 
-        table.setStyle(TableStyle([
-            # Header styling
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2563eb')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('TOPPADDING', (0, 0), (-1, 0), 12),
-
-            # Body styling
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('ALIGN', (0, 0), (0, -1), 'CENTER'),  # Index column
-            ('ALIGN', (3, 0), (3, -1), 'CENTER'),  # Qty column
-            ('ALIGN', (4, 0), (-1, -1), 'RIGHT'),  # Price columns
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('TOPPADDING', (0, 1), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 8),
-        ]))
+        table.setStyle(_LINE_ITEMS_TABLE_STYLE)
 
         elements.append(table)
         elements.append(Spacer(1, 0.3*inch))
 
     def _create_totals_section(self, elements, styles):
         """Create totals section"""
-        # Create custom style for right-aligned text
-        right_style = ParagraphStyle(
-            'RightAlign',
-            parent=styles['Normal'],
-            alignment=TA_RIGHT
-        )
+        view = self.view
 
+        # Plain strings; bolding, right alignment and the emphasized total
+        # row all come from the table style
         totals_data = [
-            [Paragraph('<b>Subtotal:</b>', styles['Normal']), Paragraph(format_currency(self.po.subtotal, self.company.currency), right_style)],
+            ['Subtotal:', view.subtotal_str],
         ]
 
-        if self.po.tax_amount > 0:
-            totals_data.append([
-                Paragraph('<b>Tax ({:.1f}%):</b>'.format(self.po.tax_rate), styles['Normal']),
-                Paragraph(format_currency(self.po.tax_amount, self.company.currency), right_style)
-            ])
+        if view.show_tax:
+            totals_data.append([view.tax_label, view.tax_str])
 
-        if self.po.shipping_cost > 0:
-            totals_data.append([
-                Paragraph('<b>Shipping:</b>', styles['Normal']),
-                Paragraph(format_currency(self.po.shipping_cost, self.company.currency), right_style)
-            ])
+        if view.show_shipping:
+            totals_data.append(['Shipping:', view.shipping_str])
 
-        totals_data.append([
-            Paragraph('<b><font size="12">Total Amount:</font></b>', styles['Normal']),
-            Paragraph(f'<b><font size="12">{format_currency(self.po.total_amount, self.company.currency)}</font></b>', right_style)
-        ])
+        totals_data.append(['Total Amount:', view.total_str])
 
         # Create totals table (right-aligned)
         totals_table = Table(totals_data, colWidths=[1.5*inch, 1.5*inch])
-        totals_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('LINEABOVE', (0, -1), (-1, -1), 1, colors.black),
-            ('TOPPADDING', (0, -1), (-1, -1), 12),
-        ]))
+        totals_table.setStyle(_TOTALS_TABLE_STYLE)
 
         # Right align the totals table
         wrapper_table = Table([[None, totals_table]], colWidths=[4*inch, 3*inch])
-        wrapper_table.setStyle(TableStyle([
-            ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
-        ]))
+        wrapper_table.setStyle(_TOTALS_WRAPPER_STYLE)
 
         elements.append(wrapper_table)
         elements.append(Spacer(1, 0.3*inch))
 
     def _create_notes_section(self, elements, styles):
         """Create notes and terms section"""
-        if self.po.notes:
+        view = self.view
+
+        if view.notes:
             elements.append(Paragraph('<b>Notes:</b>', styles['Heading3']))
-            elements.append(Paragraph(self.po.notes, styles['Normal']))
+            elements.append(Paragraph(view.notes, styles['Normal']))
             elements.append(Spacer(1, 0.2*inch))
 
-        if self.po.terms:
+        if view.terms:
             elements.append(Paragraph('<b>Terms and Conditions:</b>', styles['Heading3']))
-            elements.append(Paragraph(self.po.terms, styles['Normal']))
+            elements.append(Paragraph(view.terms, styles['Normal']))
             elements.append(Spacer(1, 0.2*inch))
 
         # Receiving location
-        elements.append(Paragraph(f'<b>Receiving Location:</b> {self.po.receiving_location.name}', styles['Normal']))
-
-    def _create_footer(self, elements, styles):
-        """Create footer"""
-        elements.append(Spacer(1, 0.5*inch))
-        footer_text = f'''
-        <para align="center">
-            <font size="8" color="gray">
-                Generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}<br/>
-                Purchase Order #{self.po.po_number}
-            </font>
-        </para>
-        '''
-        elements.append(Paragraph(footer_text, styles['Normal']))
+        elements.append(Paragraph(f'<b>Receiving Location:</b> {view.receiving_location_name}', styles['Normal']))
+
+    def _draw_footer(self, canvas, doc):
+        """Draw the footer with the low-level canvas API (no Platypus)"""
+        canvas.saveState()
+        canvas.setFont('Helvetica', 8)
+        canvas.setFillColor(colors.gray)
+        generated = datetime.now().strftime('%B %d, %Y at %I:%M %p')
+        canvas.drawCentredString(self.width / 2, 0.5 * inch, f'Generated on {generated}')
+        canvas.drawCentredString(self.width / 2, 0.38 * inch, f'Purchase Order #{self.view.po_number}')
+        canvas.restoreState()
 
     def generate(self):
         """Generate the PDF and return the buffer"""
-        # Create the PDF document
-        doc = SimpleDocTemplate(
+        # Explicit document template: one preconfigured frame, footer drawn
+        # via the canvas in onPage - no per-page Platypus footer flowable
+        # and no on-the-fly page template construction
+        doc = BaseDocTemplate(
             self.buffer,
             pagesize=self.pagesize,
             rightMargin=0.75*inch,
@@ -347,42 +580,101 @@ class PurchaseOrderPDF:
             topMargin=0.75*inch,
             bottomMargin=0.75*inch,
         )
+        # Page one reserves room for the canvas-drawn header; later pages
+        # get the full body frame
+        first_frame = Frame(
+            0.75*inch, 0.75*inch,
+            self.width - 1.5*inch, self.height - 1.5*inch - self.HEADER_HEIGHT,
+            id='first',
+        )
+        body_frame = Frame(
+            0.75*inch, 0.75*inch,
+            self.width - 1.5*inch, self.height - 1.5*inch,
+            id='body',
+        )
+        doc.addPageTemplates([
+            PageTemplate(id='first', frames=[first_frame], onPage=self._draw_first_page),
+            PageTemplate(id='later', frames=[body_frame], onPage=self._draw_footer),
+        ])
 
-        # Container for elements
-        elements = []
+        # Container for elements; every page after the first uses the
+        # full-height template
+        elements = [NextPageTemplate('later')]
 
-        # Get styles
-        styles = getSampleStyleSheet()
+        # Get styles (module-level stylesheet, built once at import)
+        styles = _STYLES
 
-        # Build document sections
-        self._create_header(elements, styles)
+        # Build document sections (header/footer are canvas callbacks now)
         self._create_title(elements, styles)
         self._create_info_section(elements, styles)
         self._create_line_items_table(elements, styles)
         self._create_totals_section(elements, styles)
         self._create_notes_section(elements, styles)
-        self._create_footer(elements, styles)
 
         # Build PDF
         doc.build(elements)
 
-        # Get PDF data
-        pdf_data = self.buffer.getvalue()
-        self.buffer.close()
+        # With a caller-supplied stream (HttpResponse, spooled temp file)
+        # the data already lives there and no copy is made; only the
+        # internal-buffer case materializes bytes. Pre-sizing the BytesIO
+        # via truncate() was considered and rejected: it leaves stale bytes
+        # past the write position, and the reallocation cost is noise next
+        # to the ReportLab layout work.
+        if not self.owns_buffer:
+            return None
 
-        return pdf_data
+        try:
+            return self.buffer.getvalue()
+        finally:
+            self.buffer.close()
 
 
-def generate_purchase_order_pdf(purchase_order, template='default'):
+def generate_purchase_order_pdf(purchase_order, template='default', stream=None):
     """
     Convenience function to generate PDF for a purchase order
 
     Args:
         purchase_order: PurchaseOrder instance
         template: PDF template style ('default', 'modern', 'classic')
+        stream: Optional file-like object to write the PDF into; when given,
+            the PDF lands there and None is returned instead of bytes
 
     Returns:
-        bytes: PDF file content
+        bytes: PDF file content (None when writing to a caller stream)
     """
-    generator = PurchaseOrderPDF(purchase_order, template=template)
+    generator = PurchaseOrderPDF(purchase_order, template=template, stream=stream)
     return generator.generate()
+
+
+def get_purchase_order_pdf_cached(purchase_order, template='default'):
+    """
+    Return PDF bytes for a purchase order, reusing a cached copy when
+    neither the PO nor its line items changed since the last generation.
+
+    The download/preview endpoints, email sends and task retries all go
+    through this helper, so the common preview-then-download sequence
+    renders once. Keys embed the modification timestamps, making
+    invalidation implicit; in production the bytes live in Redis and are
+    shared across workers.
+
+    Args:
+        purchase_order: PurchaseOrder instance
+        template: PDF template style ('default', 'modern', 'classic')
+
+    Returns:
+        bytes: PDF file content
+    """
+    latest_item_change = max(
+        (item.updated_at for item in purchase_order.line_items.all()),
+        default=purchase_order.updated_at,
+    )
+    key = (
+        f'po_pdf:{purchase_order.pk}:{template}:'
+        f'{purchase_order.updated_at.timestamp()}:{latest_item_change.timestamp()}'
+    )
+
+    pdf_data = cache.get(key)
+    if pdf_data is None:
+        pdf_data = generate_purchase_order_pdf(purchase_order, template=template)
+        cache.set(key, pdf_data, PDF_CACHE_TTL)
+    return pdf_data
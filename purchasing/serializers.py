@@ -1,3 +1,6 @@
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
 from rest_framework import serializers
 from .models import Supplier, PurchaseOrder, PurchaseOrderLineItem
 from inventory.models import Product, Location
@@ -33,11 +36,32 @@ class SupplierSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class ProductBriefSerializer(serializers.ModelSerializer):
+    """Compact product representation embedded in line items."""
+    class Meta:
+        model = Product
+        fields = ['id', 'name', 'sku', 'purchase_price']
+
+
+class SupplierBriefSerializer(serializers.ModelSerializer):
+    """Compact supplier representation embedded in PO details."""
+    class Meta:
+        model = Supplier
+        fields = ['id', 'name', 'contact_person', 'email', 'phone', 'payment_terms']
+
+
+class LocationBriefSerializer(serializers.ModelSerializer):
+    """Compact location representation embedded in PO details."""
+    class Meta:
+        model = Location
+        fields = ['id', 'name']
+
+
 class PurchaseOrderLineItemSerializer(serializers.ModelSerializer):
     """
     Serializer for purchase order line items.
     """
-    product_details = serializers.SerializerMethodField(read_only=True)
+    product_details = ProductBriefSerializer(source='product', read_only=True)
 
     class Meta:
         model = PurchaseOrderLineItem
@@ -56,20 +80,29 @@ class PurchaseOrderLineItemSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['line_total', 'product_name', 'product_sku']
 
-    def get_product_details(self, obj):
-        """Return full product details for display."""
-        return {
-            'id': obj.product.id,
-            'name': obj.product.name,
-            'sku': obj.product.sku,
-            'purchase_price': float(obj.product.purchase_price),
-        }
-
 
 class PurchaseOrderListSerializer(serializers.ModelSerializer):
     """
     Simplified serializer for purchase order list view.
     """
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Join every relation this serializer reads and trim the row to the
+        columns it serializes - notably dropping the notes/terms text blobs
+        from every list row. Keep the field list in sync with Meta.fields.
+        """
+        return queryset.select_related(
+            'supplier', 'receiving_location', 'created_by'
+        ).only(
+            'id', 'po_number', 'supplier_id', 'status', 'order_date',
+            'expected_delivery_date', 'received_date', 'receiving_location_id',
+            'subtotal', 'tax_amount', 'shipping_cost', 'total_amount',
+            'stock_added', 'created_at', 'updated_at',
+            'supplier__name', 'receiving_location__name', 'created_by__email',
+        )
+
     supplier_name = serializers.CharField(source='supplier.name', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     created_by_email = serializers.CharField(source='created_by.email', read_only=True)
@@ -105,9 +138,25 @@ class PurchaseOrderDetailSerializer(serializers.ModelSerializer):
     Detailed serializer for creating/editing purchase orders.
     Includes nested line items.
     """
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Join the FK relations and prefetch line items with their products,
+        so serializing N POs stays at a constant number of queries.
+        """
+        return queryset.select_related(
+            'supplier', 'receiving_location', 'created_by', 'company'
+        ).prefetch_related(
+            Prefetch(
+                'line_items',
+                queryset=PurchaseOrderLineItem.objects.select_related('product'),
+            )
+        )
+
     line_items = PurchaseOrderLineItemSerializer(many=True, required=False)
-    supplier_details = serializers.SerializerMethodField(read_only=True)
-    location_details = serializers.SerializerMethodField(read_only=True)
+    supplier_details = SupplierBriefSerializer(source='supplier', read_only=True)
+    location_details = LocationBriefSerializer(source='receiving_location', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
 
     class Meta:
@@ -140,23 +189,43 @@ class PurchaseOrderDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'company', 'created_by', 'po_number', 'subtotal', 'tax_amount', 'total_amount', 'stock_added', 'created_at', 'updated_at']
 
-    def get_supplier_details(self, obj):
-        """Return full supplier details."""
-        return {
-            'id': obj.supplier.id,
-            'name': obj.supplier.name,
-            'contact_person': obj.supplier.contact_person,
-            'email': obj.supplier.email,
-            'phone': obj.supplier.phone,
-            'payment_terms': obj.supplier.payment_terms,
-        }
-
-    def get_location_details(self, obj):
-        """Return location details."""
-        return {
-            'id': obj.receiving_location.id,
-            'name': obj.receiving_location.name,
-        }
+    def _create_line_items(self, purchase_order, line_items_data):
+        """Insert all line items in one bulk_create with totals pre-computed."""
+        line_items = []
+        for item_data in line_items_data:
+            product = item_data['product']
+            # Store product details at time of order
+            item_data['product_name'] = product.name
+            item_data['product_sku'] = product.sku
+
+            line_item = PurchaseOrderLineItem(
+                purchase_order=purchase_order,
+                **item_data
+            )
+            line_item.line_total = line_item.compute_line_total()
+            line_items.append(line_item)
+
+        PurchaseOrderLineItem.objects.bulk_create(line_items)
+        return line_items
+
+    def _apply_totals(self, purchase_order, line_items):
+        """
+        Compute totals from the rows just bulk-created (already in memory)
+        and persist them with a single UPDATE - no SELECT round trip.
+        """
+        subtotal = sum((item.line_total for item in line_items), Decimal('0.00'))
+        tax_amount = (subtotal * purchase_order.tax_rate) / Decimal('100')
+        total_amount = subtotal + tax_amount + purchase_order.shipping_cost
+
+        purchase_order.subtotal = subtotal
+        purchase_order.tax_amount = tax_amount
+        purchase_order.total_amount = total_amount
+        PurchaseOrder.objects.filter(pk=purchase_order.pk).update(
+            subtotal=subtotal,
+            tax_amount=tax_amount,
+            total_amount=total_amount,
+            updated_at=timezone.now(),
+        )
 
     def create(self, validated_data):
         """Create a purchase order with line items."""
@@ -166,25 +235,14 @@ class PurchaseOrderDetailSerializer(serializers.ModelSerializer):
         validated_data['company'] = self.context['request'].user.company
         validated_data['created_by'] = self.context['request'].user
 
-        # Create the purchase order
-        purchase_order = PurchaseOrder.objects.create(**validated_data)
+        with transaction.atomic():
+            purchase_order = PurchaseOrder.objects.create(**validated_data)
 
-        # Create line items
-        for item_data in line_items_data:
-            product = item_data['product']
-            # Store product details at time of order
-            item_data['product_name'] = product.name
-            item_data['product_sku'] = product.sku
+            # One INSERT for all line items instead of 2N round trips
+            line_items = self._create_line_items(purchase_order, line_items_data)
 
-            line_item = PurchaseOrderLineItem.objects.create(
-                purchase_order=purchase_order,
-                **item_data
-            )
-            # Calculate line total
-            line_item.calculate_line_total()
-
-        # Calculate totals for the purchase order
-        purchase_order.calculate_totals()
+            # Totals from the in-memory rows, one UPDATE
+            self._apply_totals(purchase_order, line_items)
 
         return purchase_order
 
@@ -195,26 +253,19 @@ class PurchaseOrderDetailSerializer(serializers.ModelSerializer):
         # Update purchase order fields
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
-
-        # If line items are provided, update them
-        if line_items_data is not None:
-            # Delete existing line items
-            instance.line_items.all().delete()
-
-            # Create new line items
-            for item_data in line_items_data:
-                product = item_data['product']
-                item_data['product_name'] = product.name
-                item_data['product_sku'] = product.sku
-
-                line_item = PurchaseOrderLineItem.objects.create(
-                    purchase_order=instance,
-                    **item_data
-                )
-                line_item.calculate_line_total()
-
-        # Recalculate totals
-        instance.calculate_totals()
+
+        with transaction.atomic():
+            instance.save()
+
+            if line_items_data is not None:
+                # Replace the items in two statements and total the new
+                # rows without re-querying them
+                instance.line_items.all().delete()
+                line_items = self._create_line_items(instance, line_items_data)
+                self._apply_totals(instance, line_items)
+            else:
+                # Header-only edits (tax rate, shipping) still need a
+                # recompute over the stored rows
+                instance.calculate_totals()
 
         return instance
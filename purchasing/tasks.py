@@ -0,0 +1,64 @@
+"""
+Celery tasks for the purchasing app.
+"""
+import smtplib
+
+import requests
+from celery import shared_task
+
+from .models import PurchaseOrder
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(smtplib.SMTPException, requests.RequestException),
+    retry_backoff=True,
+    max_retries=5,
+)
+def send_purchase_order_email_task(self, po_id, recipient_email):
+    """
+    Send a purchase order email (PDF generation, logo download, SMTP) off
+    the request thread. Failures propagate out of the builder: transient
+    SMTP/HTTP errors hit the autoretry policy and back off, anything else
+    marks the task failed instead of being silently swallowed.
+    """
+    from .email_service import _send_purchase_order_email_now
+
+    # One joined query, restricted to the columns the email body and PDF
+    # generator actually read - anything missing here would come back as a
+    # deferred per-field query, so keep this list in sync with both builders
+    purchase_order = PurchaseOrder.objects.select_related(
+        'company', 'supplier', 'receiving_location'
+    ).only(
+        'updated_at',  # read by the PDF cache key
+        'po_number', 'status', 'order_date', 'expected_delivery_date',
+        'subtotal', 'tax_rate', 'tax_amount', 'shipping_cost', 'total_amount',
+        'notes', 'terms',
+        'company__name', 'company__currency', 'company__logo',
+        'supplier__name', 'supplier__contact_person', 'supplier__email',
+        'supplier__phone', 'supplier__address',
+        'receiving_location__name',
+    ).get(pk=po_id)
+
+    return _send_purchase_order_email_now(
+        purchase_order, recipient_email, propagate_errors=True
+    )
+
+
+@shared_task
+def render_po_pdf(po_id, template='default'):
+    """
+    Render a purchase order PDF off the request thread, warming the
+    content-addressed PDF cache so a later download, preview or email
+    send serves the cached bytes instead of tying up a web worker on the
+    ReportLab build.
+    """
+    from .pdf_generator import get_purchase_order_pdf_cached
+    from .serializers import PurchaseOrderDetailSerializer
+
+    purchase_order = PurchaseOrderDetailSerializer.setup_eager_loading(
+        PurchaseOrder.objects.all()
+    ).get(pk=po_id)
+
+    pdf_data = get_purchase_order_pdf_cached(purchase_order, template=template)
+    return len(pdf_data)
@@ -3,17 +3,18 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.throttling import UserRateThrottle
 from rest_framework.response import Response
+from django.core.cache import cache
 from django.http import HttpResponse
 from django.db.models import Sum, Count, Q, F
 from django.db import transaction
 from datetime import datetime, date
-from .models import Supplier, PurchaseOrder, PurchaseOrderLineItem
+from .models import Supplier, PurchaseOrder, PurchaseOrderLineItem, PONumberCounter
 from .serializers import (
     SupplierSerializer,
     PurchaseOrderListSerializer,
     PurchaseOrderDetailSerializer
 )
-from .pdf_generator import generate_purchase_order_pdf
+from .pdf_generator import get_purchase_order_pdf_cached
 from .email_service import send_purchase_order_email
 from decimal import Decimal
 
@@ -54,11 +55,21 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     throttle_classes = [UserRateThrottle]
 
+    # Detail actions whose responses never serialize line items - the
+    # prefetch would be wasted work for them
+    _NO_LINE_ITEM_ACTIONS = {'send_to_supplier', 'destroy'}
+
     def get_queryset(self):
         company = self.request.user.company
-        queryset = PurchaseOrder.objects.filter(company=company).select_related(
-            'supplier', 'receiving_location', 'created_by'
-        )
+        queryset = PurchaseOrder.objects.filter(company=company)
+
+        if self.action in self._NO_LINE_ITEM_ACTIONS:
+            queryset = queryset.select_related('supplier', 'receiving_location', 'created_by')
+        else:
+            # The serializer knows which relations it reads; let it set up
+            # the joins/prefetches (list stays flat, detail actions get
+            # line items with their products in one prefetch)
+            queryset = self.get_serializer_class().setup_eager_loading(queryset)
 
         # Apply filters
         supplier_id = self.request.query_params.get('supplier')
@@ -98,38 +109,36 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet):
         # Get tax rate from company settings if available
         tax_rate = getattr(company, 'purchase_tax_rate', Decimal('0.00'))
 
-        # Generate PO number with retry logic
-        max_retries = 5
-        for attempt in range(max_retries):
-            try:
-                with transaction.atomic():
-                    last_po = PurchaseOrder.objects.filter(
-                        company=company
-                    ).select_for_update().order_by('-id').first()
-
-                    if last_po and last_po.po_number:
-                        try:
-                            last_number = int(last_po.po_number.split('-')[-1])
-                            new_number = last_number + 1
-                        except (ValueError, IndexError):
-                            new_number = 1
-                    else:
-                        new_number = 1
-
-                    po_number = f"PO-{new_number:05d}"
-
-                    serializer.save(
-                        company=company,
-                        created_by=self.request.user,
-                        po_number=po_number,
-                        tax_rate=tax_rate
-                    )
-                    break
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    raise
-                import time
-                time.sleep(0.1)
+        # Atomic per-company counter - no select_for_update scan, no retry
+        # loop, no sleep under contention
+        po_number = f"PO-{PONumberCounter.next_number(company):05d}"
+
+        serializer.save(
+            company=company,
+            created_by=self.request.user,
+            po_number=po_number,
+            tax_rate=tax_rate
+        )
+
+        self._schedule_pdf_prerender(serializer.instance)
+
+    def perform_update(self, serializer):
+        serializer.save()
+        self._schedule_pdf_prerender(serializer.instance)
+
+    @staticmethod
+    def _schedule_pdf_prerender(purchase_order):
+        """
+        Warm the PDF cache from a Celery worker after a write, so the next
+        download/preview/send serves cached bytes instead of running the
+        ReportLab build on a web worker. Failure to enqueue is non-fatal -
+        the synchronous path still works, just slower.
+        """
+        from .tasks import render_po_pdf
+        try:
+            render_po_pdf.delay(purchase_order.id)
+        except Exception:
+            pass
 
     @action(detail=True, methods=['post'])
     def receive_items(self, request, pk=None):
@@ -161,19 +170,38 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet):
 
         try:
             with transaction.atomic():
+                # Map payload ids to received quantities, then apply them
+                # with one SELECT and one bulk UPDATE instead of a
+                # SELECT+UPDATE pair per row (entries with unknown ids or
+                # malformed values are ignored, as the old per-row lookup
+                # was). The quantity is coerced here because the in-memory
+                # values now feed the status comparison below, where the
+                # old code compared freshly re-queried (already-int) rows.
+                received_map = {}
                 for item_data in line_items_data:
-                    line_item_id = item_data.get('id')
-                    quantity_received = item_data.get('quantity_received', 0)
-
                     try:
-                        line_item = purchase_order.line_items.get(id=line_item_id)
-                        line_item.quantity_received = quantity_received
-                        line_item.save()
-                    except PurchaseOrderLineItem.DoesNotExist:
+                        line_item_id = int(item_data.get('id'))
+                        quantity_received = int(item_data.get('quantity_received', 0))
+                    except (TypeError, ValueError):
                         continue
+                    received_map[line_item_id] = quantity_received
+
+                # Work on the already-prefetched line items: applying the
+                # payload to them in memory keeps the status check and the
+                # serialized response below consistent with the bulk UPDATE
+                # without re-querying
+                all_line_items = list(purchase_order.line_items.all())
+                updated_items = []
+                for line_item in all_line_items:
+                    if line_item.id in received_map:
+                        line_item.quantity_received = received_map[line_item.id]
+                        updated_items.append(line_item)
+
+                PurchaseOrderLineItem.objects.bulk_update(
+                    updated_items, ['quantity_received'], batch_size=500
+                )
 
                 # Check if all items are fully received
-                all_line_items = purchase_order.line_items.all()
                 all_received = all(
                     item.quantity_received >= item.quantity_ordered
                     for item in all_line_items
@@ -253,36 +281,53 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet):
         Get statistics about purchase orders.
         """
         company = request.user.company
+
+        # Dashboard endpoint hit on every page load - serve from cache and
+        # only run the aggregates on a miss (writes invalidate the key)
+        cache_key = f'po:stats:{company.id}'
+        stats = cache.get(cache_key)
+        if stats is not None:
+            return Response(stats)
+
         queryset = PurchaseOrder.objects.filter(company=company)
 
-        # Count by status
+        # All counts and sums in one conditional-aggregate pass over the
+        # table instead of ten filtered scans
+        aggregates = queryset.aggregate(
+            total_pos=Count('id'),
+            draft_pos=Count('id', filter=Q(status='DRAFT')),
+            sent_pos=Count('id', filter=Q(status='SENT')),
+            confirmed_pos=Count('id', filter=Q(status='CONFIRMED')),
+            partially_received_pos=Count('id', filter=Q(status='PARTIALLY_RECEIVED')),
+            received_pos=Count('id', filter=Q(status='RECEIVED')),
+            cancelled_pos=Count('id', filter=Q(status='CANCELLED')),
+            total_value=Sum(
+                'total_amount',
+                filter=Q(status__in=['SENT', 'CONFIRMED', 'PARTIALLY_RECEIVED', 'RECEIVED']),
+            ),
+            pending_pos_count=Count(
+                'id', filter=Q(status__in=['SENT', 'CONFIRMED', 'PARTIALLY_RECEIVED'])
+            ),
+            pending_pos_value=Sum(
+                'total_amount',
+                filter=Q(status__in=['SENT', 'CONFIRMED', 'PARTIALLY_RECEIVED']),
+            ),
+        )
+
         stats = {
-            'total_pos': queryset.count(),
-            'draft_pos': queryset.filter(status='DRAFT').count(),
-            'sent_pos': queryset.filter(status='SENT').count(),
-            'confirmed_pos': queryset.filter(status='CONFIRMED').count(),
-            'partially_received_pos': queryset.filter(status='PARTIALLY_RECEIVED').count(),
-            'received_pos': queryset.filter(status='RECEIVED').count(),
-            'cancelled_pos': queryset.filter(status='CANCELLED').count(),
+            'total_pos': aggregates['total_pos'],
+            'draft_pos': aggregates['draft_pos'],
+            'sent_pos': aggregates['sent_pos'],
+            'confirmed_pos': aggregates['confirmed_pos'],
+            'partially_received_pos': aggregates['partially_received_pos'],
+            'received_pos': aggregates['received_pos'],
+            'cancelled_pos': aggregates['cancelled_pos'],
+            'total_value': float(aggregates['total_value'] or Decimal('0.00')),
+            'pending_pos_count': aggregates['pending_pos_count'],
+            'pending_pos_value': float(aggregates['pending_pos_value'] or Decimal('0.00')),
         }
 
-        # Calculate total amounts
-        total_value = queryset.filter(
-            status__in=['SENT', 'CONFIRMED', 'PARTIALLY_RECEIVED', 'RECEIVED']
-        ).aggregate(
-            total=Sum('total_amount')
-        )['total'] or Decimal('0.00')
-
-        stats['total_value'] = float(total_value)
-
-        # Pending POs (not yet received)
-        pending_pos = queryset.filter(
-            status__in=['SENT', 'CONFIRMED', 'PARTIALLY_RECEIVED']
-        )
-        stats['pending_pos_count'] = pending_pos.count()
-        stats['pending_pos_value'] = float(
-            pending_pos.aggregate(total=Sum('total_amount'))['total'] or Decimal('0.00')
-        )
+        cache.set(cache_key, stats, timeout=30)
 
         return Response(stats)
 
@@ -298,7 +343,7 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet):
 
         try:
             # Generate PDF with specified template
-            pdf_data = generate_purchase_order_pdf(purchase_order, template=template)
+            pdf_data = get_purchase_order_pdf_cached(purchase_order, template=template)
 
             # Create HTTP response with PDF
             response = HttpResponse(pdf_data, content_type='application/pdf')
@@ -325,7 +370,7 @@ class PurchaseOrderViewSet(viewsets.ModelViewSet):
 
         try:
             # Generate PDF
-            pdf_data = generate_purchase_order_pdf(purchase_order, template=template)
+            pdf_data = get_purchase_order_pdf_cached(purchase_order, template=template)
 
             # Create HTTP response with PDF for inline display
             response = HttpResponse(pdf_data, content_type='application/pdf')
@@ -3,9 +3,10 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.throttling import UserRateThrottle
 from rest_framework import status
+from django.core.cache import cache
 from django.db.models import Sum, Count, Avg, F, Q, ExpressionWrapper, DecimalField, Case, When, Value
-from django.db.models.functions import TruncDate, TruncMonth, Coalesce, ExtractYear, ExtractMonth
-from datetime import datetime, timedelta
+from django.db.models.functions import TruncMonth, Coalesce
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 from inventory.models import Product, Stock
 from sales.models import Invoice, InvoiceLineItem, Quote
@@ -31,16 +32,29 @@ class SalesReportView(APIView):
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
 
-        # Default to last 30 days if not provided
-        if not end_date:
-            end_date = datetime.now().date()
-        else:
-            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+        # Default to last 30 days if not provided. fromisoformat is the
+        # C-level fast path for the YYYY-MM-DD strings the frontend sends.
+        try:
+            end_date = date.fromisoformat(end_date) if end_date else datetime.now().date()
+            start_date = (
+                date.fromisoformat(start_date) if start_date
+                else end_date - timedelta(days=30)
+            )
+        except ValueError:
+            return Response(
+                {"error": "Dates must be in YYYY-MM-DD format."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        if not start_date:
-            start_date = end_date - timedelta(days=30)
-        else:
-            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+        # Dashboards re-request the same range repeatedly per session -
+        # serve the whole report from cache for a few minutes. The TTL
+        # bounds staleness; there is no precise invalidation since any
+        # invoice write inside an arbitrary cached range would have to be
+        # matched against every live key.
+        cache_key = f'rep:sales:{company.id}:{start_date}:{end_date}'
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return Response(cached, status=status.HTTP_200_OK)
 
         # Filter invoices by company and date range
         invoices = Invoice.objects.filter(
@@ -49,8 +63,19 @@ class SalesReportView(APIView):
             issue_date__lte=end_date
         )
 
+        # Paid-invoice ids materialized once; every paid-scoped query below
+        # filters on this list instead of re-running the company/date/status
+        # scan as a subquery. Very large ranges fall back to the subquery
+        # form so the IN clause can't exceed the backend's parameter limit.
+        paid_invoice_ids = list(
+            invoices.filter(status='PAID').values_list('id', flat=True)[:10001]
+        )
+        if len(paid_invoice_ids) > 10000:
+            paid_invoice_ids = invoices.filter(status='PAID').values_list('id', flat=True)
+        paid_invoices = Invoice.objects.filter(id__in=paid_invoice_ids)
+
         # KPI Calculations
-        total_revenue = invoices.filter(status='PAID').aggregate(
+        total_revenue = paid_invoices.aggregate(
             total=Coalesce(Sum('total_amount'), Value(0), output_field=DecimalField())
         )['total']
 
@@ -60,55 +85,55 @@ class SalesReportView(APIView):
             avg=Coalesce(Avg('total_amount'), Value(0), output_field=DecimalField())
         )['avg']
 
-        # Calculate profit from line items
+        # Calculate profit from line items entirely in the database
         # Profit = (selling_price - purchase_price) * quantity
-        line_items = InvoiceLineItem.objects.filter(
-            invoice__in=invoices.filter(status='PAID')
-        ).select_related('product')
-
-        total_profit = Decimal('0.00')
-        for item in line_items:
-            if item.product:
-                profit_per_unit = item.unit_price - item.product.purchase_price
-                total_profit += profit_per_unit * item.quantity
+        total_profit = InvoiceLineItem.objects.filter(
+            invoice_id__in=paid_invoice_ids,
+            product__isnull=False,
+        ).aggregate(
+            total=Coalesce(
+                Sum(
+                    ExpressionWrapper(
+                        (F('unit_price') - F('product__purchase_price')) * F('quantity'),
+                        output_field=DecimalField(),
+                    )
+                ),
+                Value(0),
+                output_field=DecimalField(),
+            )
+        )['total']
 
-        # Revenue over time (daily for date ranges <= 90 days, monthly otherwise)
+        # Revenue over time (daily for date ranges <= 90 days, monthly
+        # otherwise). One Trunc-based code path - the database does the
+        # bucketing on both backends and hands back date objects directly.
         days_diff = (end_date - start_date).days
 
-        # Use simpler approach compatible with SQLite
-        if days_diff <= 90:
-            # Daily grouping - use issue_date directly
-            revenue_over_time = invoices.filter(status='PAID').values(
-                'issue_date'
-            ).annotate(
-                revenue=Sum('total_amount')
-            ).order_by('issue_date')
-        else:
-            # Monthly grouping - manual grouping for SQLite compatibility
-            revenue_over_time = invoices.filter(status='PAID').annotate(
-                year=ExtractYear('issue_date'),
-                month=ExtractMonth('issue_date')
-            ).values('year', 'month').annotate(
-                revenue=Sum('total_amount')
-            ).order_by('year', 'month')
+        # issue_date is already a date, so the daily bucket is the column
+        # itself (TruncDate on a DateField breaks SQLite's date UDF)
+        bucket = F('issue_date') if days_diff <= 90 else TruncMonth('issue_date')
+        revenue_over_time = paid_invoices.annotate(
+            bucket=bucket
+        ).values('bucket').annotate(
+            revenue=Sum('total_amount')
+        ).order_by('bucket')
 
         # Top Products by Revenue
         top_products = InvoiceLineItem.objects.filter(
-            invoice__in=invoices.filter(status='PAID')
+            invoice_id__in=paid_invoice_ids
         ).values('product__name', 'product__sku').annotate(
             total_revenue=Sum(F('quantity') * F('unit_price')),
             total_quantity=Sum('quantity')
         ).order_by('-total_revenue')[:10]
 
         # Top Clients by Revenue
-        top_clients = invoices.filter(status='PAID').values(
+        top_clients = paid_invoices.values(
             'client__name', 'client__id'
         ).annotate(
             total_revenue=Sum('total_amount'),
             invoice_count=Count('id')
         ).order_by('-total_revenue')[:10]
 
-        return Response({
+        report = {
             'period': {
                 'start_date': start_date.isoformat(),
                 'end_date': end_date.isoformat(),
@@ -123,10 +148,7 @@ class SalesReportView(APIView):
             },
             'revenue_over_time': [
                 {
-                    'date': (
-                        item['issue_date'].isoformat() if 'issue_date' in item
-                        else f"{item['year']}-{item['month']:02d}-01"
-                    ),
+                    'date': item['bucket'].isoformat(),
                     'revenue': float(item['revenue'] or 0)
                 }
                 for item in revenue_over_time
@@ -149,7 +171,11 @@ class SalesReportView(APIView):
                 }
                 for item in top_clients
             ]
-        }, status=status.HTTP_200_OK)
+        }
+
+        cache.set(cache_key, report, timeout=300)
+
+        return Response(report, status=status.HTTP_200_OK)
 
 
 class InventoryValuationView(APIView):
@@ -173,9 +199,7 @@ class InventoryValuationView(APIView):
         category_id = request.query_params.get('category')
 
         # Get all stock for this company
-        stock_queryset = Stock.objects.filter(
-            product__company=company
-        ).select_related('product', 'location', 'product__category')
+        stock_queryset = Stock.objects.filter(product__company=company)
 
         # Apply filters
         if location_id:
@@ -184,42 +208,89 @@ class InventoryValuationView(APIView):
         if category_id:
             stock_queryset = stock_queryset.filter(product__category_id=category_id)
 
-        # Calculate totals
-        total_quantity = stock_queryset.aggregate(
-            total=Coalesce(Sum('quantity'), Value(0))
-        )['total']
+        # Row value computed in SQL; totals in one aggregate instead of a
+        # Python accumulation over hydrated model instances. A denormalized
+        # Stock.inventory_value column was considered and rejected: the
+        # price lives on Product, so a DB generated column can't express it
+        # (no cross-table references) and a hand-maintained copy would have
+        # to be kept in sync from every stock and price write path for a
+        # report that is already a single indexed query.
+        value_expr = ExpressionWrapper(
+            F('quantity') * F('product__purchase_price'),
+            output_field=DecimalField(),
+        )
 
-        # Calculate total inventory value (quantity * purchase_price)
-        total_value = Decimal('0.00')
-        inventory_items = []
-
-        for stock in stock_queryset:
-            item_value = stock.quantity * stock.product.purchase_price
-            total_value += item_value
-
-            inventory_items.append({
-                'product_id': stock.product.id,
-                'product_name': stock.product.name,
-                'sku': stock.product.sku,
-                'category': stock.product.category.name if stock.product.category else None,
-                'location': stock.location.name,
-                'purchase_price': float(stock.product.purchase_price),
-                'selling_price': float(stock.product.price),
-                'quantity': stock.quantity,
-                'total_value': float(item_value)
-            })
-
-        # Sort by total value descending
-        inventory_items.sort(key=lambda x: x['total_value'], reverse=True)
+        totals = stock_queryset.aggregate(
+            total_quantity=Coalesce(Sum('quantity'), Value(0)),
+            total_value=Coalesce(Sum(value_expr), Value(0), output_field=DecimalField()),
+            row_count=Count('id'),
+        )
+        total_quantity = totals['total_quantity']
+        total_value = totals['total_value']
+
+        # Flat projection - no Product/Location/Category instances are built
+        rows = stock_queryset.annotate(item_value=value_expr).values(
+            'product__id', 'product__name', 'product__sku',
+            'product__category__name', 'location__name',
+            'product__purchase_price', 'product__price', 'quantity', 'item_value',
+        )
 
-        return Response({
+        # Sorted in SQL for every path (pagination needs the stable order
+        # anyway, and the database beats sorting dicts in Python)
+        rows = rows.order_by('-item_value')
+
+        # Optional SQL-level pagination so huge inventories don't build (or
+        # serialize) the full list in one response
+        limit = request.query_params.get('limit')
+        offset = request.query_params.get('offset')
+        paginated = limit is not None
+        if paginated:
+            try:
+                limit = int(limit)
+                offset = int(offset or 0)
+                if limit < 0 or offset < 0:
+                    raise ValueError
+            except ValueError:
+                return Response(
+                    {"error": "limit and offset must be non-negative integers."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            rows = rows[offset:offset + limit]
+
+        inventory_items = [
+            {
+                'product_id': row['product__id'],
+                'product_name': row['product__name'],
+                'sku': row['product__sku'],
+                'category': row['product__category__name'],
+                'location': row['location__name'],
+                'purchase_price': float(row['product__purchase_price']),
+                'selling_price': float(row['product__price']),
+                'quantity': row['quantity'],
+                'total_value': float(row['item_value'])
+            }
+            # Stream rows from the database in chunks instead of
+            # materializing the full result set a second time in the
+            # queryset cache alongside the response list
+            for row in rows.iterator(chunk_size=2000)
+        ]
+
+        response_data = {
             'kpis': {
                 'total_quantity': total_quantity,
                 'total_inventory_value': float(total_value),
-                'unique_products': len(inventory_items)
+                'unique_products': totals['row_count']
             },
             'inventory_items': inventory_items
-        }, status=status.HTTP_200_OK)
+        }
+        if paginated:
+            response_data['pagination'] = {
+                'limit': limit,
+                'offset': offset,
+                'total_items': totals['row_count'],
+            }
+
+        return Response(response_data, status=status.HTTP_200_OK)
 
 
 class QuoteConversionView(APIView):
@@ -242,16 +313,19 @@ class QuoteConversionView(APIView):
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
 
-        # Default to last 30 days if not provided
-        if not end_date:
-            end_date = datetime.now().date()
-        else:
-            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
-
-        if not start_date:
-            start_date = end_date - timedelta(days=30)
-        else:
-            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+        # Default to last 30 days if not provided. fromisoformat is the
+        # C-level fast path for the YYYY-MM-DD strings the frontend sends.
+        try:
+            end_date = date.fromisoformat(end_date) if end_date else datetime.now().date()
+            start_date = (
+                date.fromisoformat(start_date) if start_date
+                else end_date - timedelta(days=30)
+            )
+        except ValueError:
+            return Response(
+                {"error": "Dates must be in YYYY-MM-DD format."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
         # Filter quotes by company and date range
         quotes = Quote.objects.filter(
@@ -260,18 +334,22 @@ class QuoteConversionView(APIView):
             date_issued__lte=end_date
         )
 
-        # Count by status
-        total_quotes = quotes.count()
-        status_breakdown = quotes.values('status').annotate(
-            count=Count('id')
+        # All status counts in one conditional aggregate - a single scan
+        # instead of a COUNT plus a GROUP BY pass
+        counts = quotes.aggregate(
+            total=Count('id'),
+            accepted=Count('id', filter=Q(status='ACCEPTED')),
+            invoiced=Count('id', filter=Q(status='INVOICED')),
+            rejected=Count('id', filter=Q(status='REJECTED')),
+            sent=Count('id', filter=Q(status='SENT')),
+            draft=Count('id', filter=Q(status='DRAFT')),
         )
 
-        status_counts = {item['status']: item['count'] for item in status_breakdown}
-
-        quotes_sent = status_counts.get('SENT', 0) + status_counts.get('ACCEPTED', 0) + status_counts.get('REJECTED', 0) + status_counts.get('INVOICED', 0)
-        quotes_accepted = status_counts.get('ACCEPTED', 0) + status_counts.get('INVOICED', 0)
-        quotes_rejected = status_counts.get('REJECTED', 0)
-        quotes_draft = status_counts.get('DRAFT', 0)
+        total_quotes = counts['total']
+        quotes_accepted = counts['accepted'] + counts['invoiced']
+        quotes_rejected = counts['rejected']
+        quotes_sent = counts['sent'] + quotes_accepted + quotes_rejected
+        quotes_draft = counts['draft']
 
         # Calculate conversion rate
         conversion_rate = (quotes_accepted / quotes_sent * 100) if quotes_sent > 0 else 0
@@ -282,10 +360,10 @@ class QuoteConversionView(APIView):
 
         # Status breakdown for pie chart
         status_distribution = [
-            {'status': 'Accepted', 'count': status_counts.get('ACCEPTED', 0) + status_counts.get('INVOICED', 0)},
-            {'status': 'Rejected', 'count': status_counts.get('REJECTED', 0)},
-            {'status': 'Sent (Pending)', 'count': status_counts.get('SENT', 0)},
-            {'status': 'Draft', 'count': status_counts.get('DRAFT', 0)},
+            {'status': 'Accepted', 'count': quotes_accepted},
+            {'status': 'Rejected', 'count': quotes_rejected},
+            {'status': 'Sent (Pending)', 'count': counts['sent']},
+            {'status': 'Draft', 'count': quotes_draft},
         ]
 
         # Top performing clients by acceptance rate
@@ -2,6 +2,7 @@
 Email service for sending quotes and invoices to clients
 """
 from django.core.mail import EmailMessage
+from django.core.cache import cache
 from django.template.loader import render_to_string
 from django.conf import settings
 from .pdf_generator import generate_quote_pdf, generate_invoice_pdf
@@ -12,10 +13,43 @@ from io import BytesIO
 
 logger = logging.getLogger(__name__)
 
+# Logo bytes rarely change; an hour of caching means only the first email
+# per company pays the download. Same cache key as the purchasing email
+# service, so one fetch serves quotes, invoices and purchase orders alike.
+LOGO_CACHE_TTL = 3600
+
+
+def _download_logo(logo):
+    """Fetch raw logo bytes via the storage backend (GCS) or HTTPS."""
+    if getattr(settings, 'USE_GCS', False):
+        # django-storages reads the blob directly - no public HTTPS GET
+        with logo.open('rb') as f:
+            return f.read()
+    response = requests.get(logo.url, timeout=10)
+    response.raise_for_status()
+    return response.content
+
+
+def _get_company_logo_bytes(company):
+    """
+    Return (ext, bytes) for the company logo, cached per company.
+
+    The key includes the stored file name, so replacing the logo
+    invalidates the cached bytes automatically.
+    """
+    logo = company.logo
+    ext = logo.name.split('.')[-1] if '.' in logo.name else 'png'
+    key = f'po_logo:{company.pk}:{logo.name}'
+    data = cache.get_or_set(key, lambda: _download_logo(logo), timeout=LOGO_CACHE_TTL)
+    return ext, data
+
 
 def send_quote_email(quote, recipient_email=None):
     """
-    Send quote via email to client with PDF attachment
+    Queue a quote email for delivery to the client.
+
+    PDF generation, the logo download and SMTP all happen in a Celery
+    task so the request thread returns immediately.
 
     Args:
         quote: Quote instance
@@ -24,7 +58,8 @@ def send_quote_email(quote, recipient_email=None):
     Returns:
         dict: Result with success/error message
     """
-    # Use client email if not specified
+    # Resolve the recipient synchronously so the caller still gets an
+    # immediate error when the client has no email address
     if not recipient_email:
         recipient_email = quote.client.email
 
@@ -34,6 +69,24 @@ def send_quote_email(quote, recipient_email=None):
             'error': 'No email address available for this client'
         }
 
+    # Imported here to avoid a circular import (tasks.py uses this module)
+    from .tasks import send_quote_email_task
+    send_quote_email_task.delay(quote.id, recipient_email)
+
+    return {
+        'success': True,
+        'message': f'Quote queued for delivery to {recipient_email}'
+    }
+
+
+def _send_quote_email_now(quote, recipient_email, propagate_errors=False):
+    """
+    Build and send the quote email synchronously.
+
+    Called from the Celery task; use send_quote_email from request-path
+    code instead. With propagate_errors, send failures re-raise after
+    logging so the task's autoretry policy can see them.
+    """
     try:
         # Generate PDF
         pdf_data = generate_quote_pdf(quote)
@@ -220,18 +273,13 @@ def send_quote_email(quote, recipient_email=None):
         # Attach company logo as inline image if it exists
         if quote.company.logo:
             try:
-                # Download the logo from GCS
-                logo_url = quote.company.logo.url
-                response = requests.get(logo_url, timeout=10)
-                response.raise_for_status()
-
-                # Get the file extension
-                logo_name = quote.company.logo.name
-                ext = logo_name.split('.')[-1] if '.' in logo_name else 'png'
+                # Cached per company - only the first email in a batch
+                # actually downloads the logo
+                ext, logo_bytes = _get_company_logo_bytes(quote.company)
 
                 # Attach as inline image with Content-ID
                 from email.mime.image import MIMEImage
-                inline_image = MIMEImage(response.content)
+                inline_image = MIMEImage(logo_bytes)
                 inline_image.add_header('Content-ID', '<company_logo>')
                 inline_image.add_header('Content-Disposition', 'inline', filename=f'logo.{ext}')
                 email.attachments.append(inline_image)
@@ -252,6 +300,8 @@ def send_quote_email(quote, recipient_email=None):
 
     except Exception as e:
         logger.error(f"Failed to send quote {quote.quote_number} to {recipient_email}: {str(e)}")
+        if propagate_errors:
+            raise
         return {
             'success': False,
             'error': str(e)
@@ -260,7 +310,7 @@ def send_quote_email(quote, recipient_email=None):
 
 def send_invoice_email(invoice, recipient_email=None):
     """
-    Send invoice via email to client with PDF attachment
+    Queue an invoice email for delivery to the client.
 
     Args:
         invoice: Invoice instance
@@ -269,7 +319,8 @@ def send_invoice_email(invoice, recipient_email=None):
     Returns:
         dict: Result with success/error message
     """
-    # Use client email if not specified
+    # Resolve the recipient synchronously so the caller still gets an
+    # immediate error when the client has no email address
     if not recipient_email:
         recipient_email = invoice.client.email
 
@@ -279,6 +330,24 @@ def send_invoice_email(invoice, recipient_email=None):
             'error': 'No email address available for this client'
         }
 
+    # Imported here to avoid a circular import (tasks.py uses this module)
+    from .tasks import send_invoice_email_task
+    send_invoice_email_task.delay(invoice.id, recipient_email)
+
+    return {
+        'success': True,
+        'message': f'Invoice queued for delivery to {recipient_email}'
+    }
+
+
+def _send_invoice_email_now(invoice, recipient_email, propagate_errors=False):
+    """
+    Build and send the invoice email synchronously.
+
+    Called from the Celery task; use send_invoice_email from request-path
+    code instead. With propagate_errors, send failures re-raise after
+    logging so the task's autoretry policy can see them.
+    """
     try:
         # Generate PDF
         pdf_data = generate_invoice_pdf(invoice)
@@ -488,18 +557,13 @@ def send_invoice_email(invoice, recipient_email=None):
         # Attach company logo as inline image if it exists
         if invoice.company.logo:
             try:
-                # Download the logo from GCS
-                logo_url = invoice.company.logo.url
-                response = requests.get(logo_url, timeout=10)
-                response.raise_for_status()
-
-                # Get the file extension
-                logo_name = invoice.company.logo.name
-                ext = logo_name.split('.')[-1] if '.' in logo_name else 'png'
+                # Cached per company - only the first email in a batch
+                # actually downloads the logo
+                ext, logo_bytes = _get_company_logo_bytes(invoice.company)
 
                 # Attach as inline image with Content-ID
                 from email.mime.image import MIMEImage
-                inline_image = MIMEImage(response.content)
+                inline_image = MIMEImage(logo_bytes)
                 inline_image.add_header('Content-ID', '<company_logo>')
                 inline_image.add_header('Content-Disposition', 'inline', filename=f'logo.{ext}')
                 email.attachments.append(inline_image)
@@ -520,6 +584,8 @@ def send_invoice_email(invoice, recipient_email=None):
 
     except Exception as e:
         logger.error(f"Failed to send invoice {invoice.invoice_number} to {recipient_email}: {str(e)}")
+        if propagate_errors:
+            raise
         return {
             'success': False,
             'error': str(e)
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-09-01 23:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("company", "0005_company_language"),
+        ("inventory", "0006_product_purchase_price"),
+        ("sales", "0005_invoice_number_unique_per_company"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(
+                fields=["company", "issue_date"], name="sales_invoi_company_b1c137_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(
+                fields=["company", "status", "issue_date"],
+                name="sales_invoi_company_0e5490_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="quote",
+            index=models.Index(
+                fields=["company", "status", "date_issued"],
+                name="sales_quote_company_a76ff1_idx",
+            ),
+        ),
+    ]
@@ -46,6 +46,8 @@ class Quote(models.Model):
             models.Index(fields=['quote_number']),
             models.Index(fields=['status']),
             models.Index(fields=['date_issued']),
+            # Backs the conversion report's company/date/status predicates
+            models.Index(fields=['company', 'status', 'date_issued']),
         ]
 
     def __str__(self):
@@ -183,6 +185,10 @@ class Invoice(models.Model):
             models.Index(fields=['invoice_number']),
             models.Index(fields=['status']),
             models.Index(fields=['issue_date']),
+            # Back the sales report's predicates: company+date range scans
+            # and the paid-in-range filter
+            models.Index(fields=['company', 'issue_date']),
+            models.Index(fields=['company', 'status', 'issue_date']),
             models.Index(fields=['due_date']),
         ]
 
@@ -0,0 +1,46 @@
+"""
+Celery tasks for the sales app.
+"""
+import smtplib
+
+import requests
+from celery import shared_task
+
+from .models import Quote, Invoice
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(smtplib.SMTPException, requests.RequestException),
+    retry_backoff=True,
+    max_retries=5,
+)
+def send_quote_email_task(self, quote_id, recipient_email):
+    """
+    Send a quote email (PDF generation, logo download, SMTP) off the
+    request thread. Failures propagate out of the builder: transient
+    SMTP/HTTP errors hit the autoretry policy and back off, anything else
+    marks the task failed instead of being silently swallowed.
+    """
+    from .email_service import _send_quote_email_now
+
+    quote = Quote.objects.select_related('company', 'client').get(pk=quote_id)
+    return _send_quote_email_now(quote, recipient_email, propagate_errors=True)
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(smtplib.SMTPException, requests.RequestException),
+    retry_backoff=True,
+    max_retries=5,
+)
+def send_invoice_email_task(self, invoice_id, recipient_email):
+    """
+    Send an invoice email off the request thread, mirroring the quote
+    task. Failures propagate out of the builder so the autoretry policy
+    is reachable.
+    """
+    from .email_service import _send_invoice_email_now
+
+    invoice = Invoice.objects.select_related('company', 'client').get(pk=invoice_id)
+    return _send_invoice_email_now(invoice, recipient_email, propagate_errors=True)
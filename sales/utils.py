@@ -1,6 +1,7 @@
 """
 Utility functions for sales module
 """
+from functools import lru_cache
 
 # Currency symbols mapping
 CURRENCY_SYMBOLS = {
@@ -113,6 +114,10 @@ def get_currency_symbol(currency_code):
     return CURRENCY_SYMBOLS.get(currency_code, currency_code)
 
 
+# Memoized per process: (Decimal, str) keys are hashable and immutable, and
+# documents repeat the same amount/currency pairs constantly (line totals,
+# email + PDF for the same PO, batches sharing a currency)
+@lru_cache(maxsize=4096)
 def format_currency(amount, currency_code):
     """
     Format a monetary amount with the appropriate currency symbol.
@@ -134,6 +139,30 @@ def format_currency(amount, currency_code):
     return f'{symbol}{amount:.2f}'
 
 
+def make_currency_formatter(currency_code):
+    """
+    Build an amount formatter specialized for one currency.
+
+    Resolves the symbol and its placement once, so callers formatting many
+    amounts for the same document (line items, totals) skip the per-call
+    lookups in format_currency.
+
+    Args:
+        currency_code (str): Currency code (e.g., 'USD', 'EUR')
+
+    Returns:
+        callable: Function mapping an amount to its formatted string
+    """
+    symbol = get_currency_symbol(currency_code)
+
+    # For currencies that go after the amount
+    if currency_code in ['XAF', 'XOF', 'CFA']:
+        return lambda amount: f'{amount:.2f} {symbol}'
+
+    # Default: symbol before amount
+    return lambda amount: f'{symbol}{amount:.2f}'
+
+
 def get_pdf_text(key, language='en'):
     """
     Get translated text for PDF documents.
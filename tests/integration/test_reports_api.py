@@ -0,0 +1,76 @@
+"""
+Integration tests for the inventory valuation report's pagination contract.
+"""
+import pytest
+from decimal import Decimal
+from rest_framework import status
+
+from company.models import Company
+from inventory.models import Location, Product, Stock
+
+VALUATION_URL = '/api/reports/inventory-valuation/'
+
+
+@pytest.fixture
+def company_user(user):
+    """Attach the test user to a company (reports require one)."""
+    company = Company.objects.create(name='Report Co')
+    user.company = company
+    user.save()
+    return user
+
+
+@pytest.fixture
+def stocked_company(company_user):
+    """Create a few stock rows with distinct values for ordering checks."""
+    company = company_user.company
+    location = Location.objects.create(company=company, name='Main')
+    for index in range(3):
+        product = Product.objects.create(
+            company=company,
+            name=f'Product {index}',
+            purchase_price=Decimal(index + 1),
+            price=Decimal(index + 2),
+        )
+        Stock.objects.create(product=product, location=location, quantity=index + 1)
+    return company
+
+
+@pytest.mark.django_db
+@pytest.mark.integration
+class TestInventoryValuationPagination:
+    """Pagination contract of the inventory valuation report."""
+
+    def test_unpaginated_response_sorted_by_value(self, authenticated_client, stocked_company):
+        response = authenticated_client.get(VALUATION_URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert 'pagination' not in data
+        assert data['kpis']['unique_products'] == 3
+        values = [item['total_value'] for item in data['inventory_items']]
+        assert values == sorted(values, reverse=True)
+
+    def test_limit_and_offset_slice_the_sorted_rows(self, authenticated_client, stocked_company):
+        full = authenticated_client.get(VALUATION_URL).json()['inventory_items']
+
+        response = authenticated_client.get(VALUATION_URL, {'limit': 1, 'offset': 1})
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data['pagination'] == {'limit': 1, 'offset': 1, 'total_items': 3}
+        assert len(data['inventory_items']) == 1
+        assert data['inventory_items'][0] == full[1]
+        # KPIs describe the whole inventory, not the page
+        assert data['kpis']['unique_products'] == 3
+
+    @pytest.mark.parametrize('params', [
+        {'limit': '-1'},
+        {'limit': '1', 'offset': '-2'},
+        {'limit': 'abc'},
+        {'limit': '1', 'offset': 'x'},
+    ])
+    def test_negative_or_malformed_params_return_400(self, authenticated_client, stocked_company, params):
+        response = authenticated_client.get(VALUATION_URL, params)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
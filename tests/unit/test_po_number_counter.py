@@ -0,0 +1,54 @@
+"""
+Unit tests for the per-company PO number counter.
+"""
+import pytest
+from datetime import date
+
+from company.models import Company
+from inventory.models import Location
+from purchasing.models import PONumberCounter, PurchaseOrder, Supplier
+
+
+@pytest.fixture
+def company(db):
+    return Company.objects.create(name='Counter Co')
+
+
+def _make_po(company, po_number):
+    location = Location.objects.create(company=company, name='Main')
+    supplier = Supplier.objects.create(company=company, name='Supplier')
+    return PurchaseOrder.objects.create(
+        company=company,
+        supplier=supplier,
+        po_number=po_number,
+        order_date=date.today(),
+        receiving_location=location,
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.unit
+class TestPONumberCounter:
+    """Seeding and increment behavior of PONumberCounter."""
+
+    def test_starts_at_one_for_a_fresh_company(self, company):
+        assert PONumberCounter.next_number(company) == 1
+        assert PONumberCounter.next_number(company) == 2
+
+    def test_seeds_from_the_highest_existing_po_number(self, company):
+        _make_po(company, 'PO-00041')
+
+        assert PONumberCounter.next_number(company) == 42
+
+    def test_unparseable_existing_number_seeds_from_zero(self, company):
+        _make_po(company, 'LEGACY')
+
+        assert PONumberCounter.next_number(company) == 1
+
+    def test_counters_are_independent_per_company(self, company):
+        other = Company.objects.create(name='Other Co')
+        _make_po(company, 'PO-00007')
+
+        assert PONumberCounter.next_number(company) == 8
+        assert PONumberCounter.next_number(other) == 1
+        assert PONumberCounter.next_number(company) == 9